@@ -1,11 +1,21 @@
 import os
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict
 
-from sqlalchemy.pool import StaticPool
-from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import QueuePool, StaticPool
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./backend/app.db")
 
+# PostgreSQL pool sizing, env-tunable so production can be resized without
+# a code change. Defaults match the documented Railway configuration.
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.environ.get("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "3600"))
+
 
 def _engine_kwargs(database_url: str) -> Dict[str, Any]:
     """Generate engine configuration based on database type."""
@@ -19,26 +29,135 @@ def _engine_kwargs(database_url: str) -> Dict[str, Any]:
         if ":memory:" in database_url:
             # Ensure a consistent in-memory database connection for testing
             kwargs["poolclass"] = StaticPool
+        else:
+            # File-based SQLite defaults to NullPool, reopening the database
+            # (and re-applying the connect-time PRAGMAs) on every request.
+            # Pool connections instead; LIFO keeps hot connections warm.
+            kwargs["poolclass"] = QueuePool
+            kwargs["pool_size"] = 5
+            kwargs["max_overflow"] = 10
+            kwargs["pool_recycle"] = 1800
+            kwargs["pool_use_lifo"] = True
     elif database_url.startswith("postgresql"):
         # PostgreSQL-specific configuration
         # Connection pooling settings for production
         kwargs["pool_pre_ping"] = True  # Verify connections before using
-        kwargs["pool_size"] = 10
-        kwargs["max_overflow"] = 20
+        kwargs["pool_size"] = DB_POOL_SIZE
+        kwargs["max_overflow"] = DB_MAX_OVERFLOW
+        kwargs["pool_timeout"] = DB_POOL_TIMEOUT
+        kwargs["pool_recycle"] = DB_POOL_RECYCLE  # Retire stale connections
+
+    return kwargs
+
+
+def _async_database_url(database_url: str) -> str:
+    """Map DATABASE_URL onto its async driver equivalent."""
+    if database_url.startswith("sqlite"):
+        return database_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    if database_url.startswith("postgresql"):
+        return database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return database_url
+
+
+def _async_engine_kwargs(database_url: str) -> Dict[str, Any]:
+    """Generate async engine configuration based on database type.
+
+    Mirrors _engine_kwargs, minus the sync-driver connect_args (aiosqlite
+    manages its own worker thread, so check_same_thread doesn't apply).
+    """
+    kwargs: Dict[str, Any] = {"echo": False}
+
+    if database_url.startswith("sqlite"):
+        if ":memory:" in database_url:
+            kwargs["poolclass"] = StaticPool
+        else:
+            # Default AsyncAdaptedQueuePool, sized like the sync engine
+            kwargs["pool_size"] = 5
+            kwargs["max_overflow"] = 10
+            kwargs["pool_recycle"] = 1800
+            kwargs["pool_use_lifo"] = True
+    elif database_url.startswith("postgresql"):
+        kwargs["pool_pre_ping"] = True
+        kwargs["pool_size"] = DB_POOL_SIZE
+        kwargs["max_overflow"] = DB_MAX_OVERFLOW
+        kwargs["pool_timeout"] = DB_POOL_TIMEOUT
+        kwargs["pool_recycle"] = DB_POOL_RECYCLE
 
     return kwargs
 
 
+# Sync engine: table creation at startup and offline scripts
 engine = create_engine(
     DATABASE_URL,
     **_engine_kwargs(DATABASE_URL),
 )
 
+# Async engine: request handlers. DB waits run on the event loop (asyncpg /
+# aiosqlite) instead of tying up threadpool workers per request.
+async_engine = create_async_engine(
+    _async_database_url(DATABASE_URL),
+    **_async_engine_kwargs(DATABASE_URL),
+)
+
+# expire_on_commit=False keeps committed instances readable for response
+# serialization without an implicit (and, under asyncio, illegal) lazy
+# refresh after the session is done.
+async_session_factory = async_sessionmaker(
+    async_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+if DATABASE_URL.startswith("sqlite") and ":memory:" not in DATABASE_URL:
+
+    def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        """Configure SQLite for concurrent request load on every new connection.
+
+        WAL allows readers to proceed alongside a writer, and
+        synchronous=NORMAL drops the per-commit fsync that dominates write
+        latency in the default rollback-journal mode. Skipped for in-memory
+        databases (tests), where WAL is meaningless.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB memory-mapped I/O
+        cursor.close()
+
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+
+# Columns served by substring (ILIKE '%x%') filters in the list endpoints.
+# On PostgreSQL these get pg_trgm GIN indexes so the planner can satisfy
+# the filters without a full table scan; SQLite (local, small inventories)
+# keeps plain scans.
+_TRGM_INDEXES = (
+    ("product_brand_trgm", "product", "brand"),
+    ("product_material_trgm", "product", "material"),
+    ("product_color_name_trgm", "product", "color_name"),
+    ("spool_storage_location_trgm", "spool", "storage_location"),
+)
+
 
 def init_db() -> None:
-    """Create database tables if they don't exist."""
+    """Create database tables (and search indexes) if they don't exist.
+
+    Runs on the sync engine; init_async_db() must also run so the async
+    engine the request handlers use sees the schema.
+    """
     try:
         SQLModel.metadata.create_all(engine)
+        if engine.dialect.name == "postgresql":
+            with engine.connect() as conn:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                for name, table, column in _TRGM_INDEXES:
+                    conn.execute(text(
+                        f"CREATE INDEX IF NOT EXISTS {name} "
+                        f"ON {table} USING gin ({column} gin_trgm_ops)"
+                    ))
+                conn.commit()
     except Exception as e:
         # Log error but don't crash - allows app to start even if DB is temporarily unavailable
         import logging
@@ -46,7 +165,20 @@ def init_db() -> None:
         raise
 
 
-def get_session() -> Session:
-    """Yield a database session for dependency injection."""
-    with Session(engine) as session:
+async def init_async_db() -> None:
+    """Create database tables on the async engine if they don't exist.
+
+    The request handlers get their sessions from async_engine, which for
+    sqlite:///:memory: is a *different* database than the sync engine —
+    init_db() alone would leave it without tables. For file-backed SQLite
+    and PostgreSQL both engines share the physical database, so this is a
+    cheap no-op re-check there.
+    """
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """Yield an async database session for dependency injection."""
+    async with async_session_factory() as session:
         yield session
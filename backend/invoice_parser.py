@@ -1,12 +1,195 @@
+import copy
+import hashlib
+import io
+import os
 import re
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from typing import List, Dict, Optional
 from datetime import datetime
 import pdfplumber
 
+# Text-extraction backend. The vendor parsers were tuned against
+# pdfplumber's output, so it stays the default; PDF_BACKEND=pypdf or
+# PDF_BACKEND=pypdfium2 opts into layout-free extractors that are
+# considerably faster for batch ingestion. Unknown or missing backends
+# fall back to pdfplumber.
+_PDF_BACKEND = os.environ.get("PDF_BACKEND", "pdfplumber").lower()
+
+
+def _open_pdf(pdf_bytes: bytes, **kwargs) -> "pdfplumber.PDF":
+    """Open pdf_bytes with pdfplumber through a single BytesIO wrapper."""
+    return pdfplumber.open(io.BytesIO(pdf_bytes), **kwargs)
+
+
+@dataclass(slots=True)
+class InvoiceItem:
+    """One line item parsed from an invoice.
+
+    Slotted so that large invoice batches don't pay a per-item dict;
+    callers that need JSON (or the old dict shape) use to_dict().
+    """
+
+    brand: str
+    material: str
+    color_name: str
+    diameter_mm: float
+    sku: Optional[str]
+    quantity: int
+    price: Optional[float]
+    product_line: str
+
+    def to_dict(self) -> Dict[str, any]:
+        """Return the plain-dict form used in JSON responses."""
+        return asdict(self)
+
+
+# Compiled once at import; these run inside per-line loops where re-parsing
+# (or even re-probing the re module's pattern cache) adds up on long invoices.
+_RE_BAMBU_ORDER_NUM = re.compile(r"Order Number:\s*([A-Za-z0-9]+)")
+_RE_BAMBU_INVOICE_DATE = re.compile(r"Invoice Date:\s*(\d{4}-\d{2}-\d{2})")
+# One Bambu item block: a product-name line starting with a material type,
+# an optional continuation line ("PLA Silk" / "Multi-Color"), then up to
+# eight follow-up lines (SKU, tax, qty/price, variant) stopping at the next
+# product or the invoice summary section.
+_RE_BAMBU_ITEM = re.compile(
+    r"^[ \t]*(?P<product>(?:PLA|PETG|ABS|TPU|ASA)[^\n]*)\n"
+    r"(?:[ \t]*(?P<cont>(?:Multi-Color|for AMS|HF)[^\n]*)\n)?"
+    r"(?P<body>(?:[ \t]*(?!(?:PLA|PETG|ABS|TPU|ASA)\b"
+    r"|Items Subtotal|Shipping|Grand total|Total exclude)[^\n]*\n?){0,8})",
+    re.MULTILINE,
+)
+# One combined alternation classifies every interesting line of an item
+# block in a single engine pass; the matched named group says which kind
+# of line it was (SKU, qty/price, or variant).
+_RE_BAMBU_BODY = re.compile(
+    r"SKU:\s*(?P<sku>[A-Z0-9-]+)"
+    r"|^[ \t]*(?:SPL(?:FREE)?\s+)?(?P<qty>\d+)\s+\$(?P<price>\d+\.\d+)"
+    r"|Variant:\s*(?P<variant>[^(]+?)\s*\(",
+    re.MULTILINE,
+)
+# Case-sensitive: invoice text casing is stable (tax markers are uppercase,
+# "Refill"/"Filament"/"with spool" appear exactly as printed), so the regex
+# engine skips per-char case folding
+_RE_COLOR_CLEANUP = re.compile(
+    r'\s+(TAX|WA STATE|WA CITY|Refill|Filament|with spool|/).*$'
+)
+# Amazon description keywords, each found with one linear scan via a single
+# alternation instead of ~20 separate substring passes. Longer alternatives
+# come first so they win at a shared start position; priority between
+# separate occurrences is resolved by the ordered canonical tables below.
+_RE_AMZ_BRAND = re.compile(r"esun|sunlu|overture|polymaker|hatchbox|bambu")
+_AMZ_BRANDS = (
+    ("esun", "eSUN"),
+    ("sunlu", "Sunlu"),
+    ("overture", "Overture"),
+    ("polymaker", "Polymaker"),
+    ("hatchbox", "Hatchbox"),
+    ("bambu", "Bambu Lab"),
+)
+_RE_AMZ_MATERIAL = re.compile(
+    r"pla\+|pla plus|pla matte|matte pla|pla silk|silk pla|pla|petg|tpu|abs|asa"
+)
+_AMZ_MATERIALS = (
+    ("pla+", "PLA+"),
+    ("pla plus", "PLA+"),
+    ("pla matte", "PLA Matte"),
+    ("matte pla", "PLA Matte"),
+    ("pla silk", "PLA Silk"),
+    ("silk pla", "PLA Silk"),
+    ("pla", "PLA"),
+    ("petg", "PETG"),
+    ("tpu", "TPU"),
+    ("abs", "ABS"),
+    ("asa", "ASA"),
+)
+# Longest-first so compound names ("deep black") win over their
+# substrings ("black") on the first hit, with no second pass needed
+_AMZ_COLORS_SORTED = tuple(sorted(
+    (
+        "deep black", "cold white", "cool white", "pine green", "black",
+        "white", "grey", "gray", "red", "blue", "green", "yellow", "orange",
+        "purple", "pink", "gold", "silver", "copper", "brown",
+    ),
+    key=len,
+    reverse=True,
+))
+_RE_AMAZON_ORDER = re.compile(r"Order #\s*(\d{3}-\d{7}-\d{7})")
+_RE_AMAZON_DATE = re.compile(r"Order placed\s+([A-Za-z]+\s+\d{1,2},\s+\d{4})")
+_RE_PRICE_LINE = re.compile(r"^\$(\d+\.\d{2})$")
+_RE_LEADING_PRICE = re.compile(r'^\$\d+\.\d{2}\s+')
+
+# Line markers for the Amazon block scan. str.startswith accepts a tuple and
+# checks all prefixes in one C-level call.
+_AMZ_SELLER_PREFIXES = ("Sold by:", "Supplied by:")
+_AMZ_STOP_PREFIXES = ("Delivered", "Return or replace", "Order #", "Supplied by:")
+
+# Substrings that mark an Amazon item as filament (checked lowercased)
+_AMZ_FILAMENT_KEYWORDS = ("filament", "pla", "petg", "tpu", "abs")
+
+# Bambu material classification: most-specific rule first; a rule fires when
+# all its tokens appear in the (uppercased, "-"-split) product name
+_BAMBU_MATERIAL_RULES = (
+    (frozenset({"PLA", "SILK", "MULTI"}), "PLA SILK MULTI-COLOR"),
+    (frozenset({"PLA", "SILK"}), "PLA SILK"),
+    (frozenset({"PLA", "MATTE"}), "PLA MATTE"),
+    (frozenset({"PLA", "TOUGH+"}), "PLA TOUGH+"),
+    (frozenset({"PLA", "TOUGH"}), "PLA TOUGH+"),
+    (frozenset({"PLA", "BASIC"}), "PLA BASIC"),
+    (frozenset({"PLA"}), "PLA"),
+    (frozenset({"PETG", "HF"}), "PETG HF"),
+    (frozenset({"PETG"}), "PETG"),
+    (frozenset({"ABS"}), "ABS"),
+    (frozenset({"TPU"}), "TPU"),
+    (frozenset({"ASA"}), "ASA"),
+)
+
 
 class InvoiceParser:
     """Parse PDF invoices to extract filament order information."""
 
+    @staticmethod
+    def _extract_full_text(pdf_bytes: bytes) -> str:
+        """Open the PDF once and extract the text of all pages."""
+        if _PDF_BACKEND == "pypdf":
+            try:
+                from pypdf import PdfReader
+            except ImportError:
+                pass
+            else:
+                reader = PdfReader(io.BytesIO(pdf_bytes))
+                return "\n".join(
+                    (page.extract_text() or "") for page in reader.pages
+                ) + "\n"
+        elif _PDF_BACKEND == "pypdfium2":
+            try:
+                import pypdfium2 as pdfium
+            except ImportError:
+                pass
+            else:
+                doc = pdfium.PdfDocument(pdf_bytes)
+                try:
+                    return "\n".join(
+                        page.get_textpage().get_text_range() for page in doc
+                    ) + "\n"
+                finally:
+                    doc.close()
+
+        with _open_pdf(pdf_bytes) as pdf:
+            # Single join instead of += accumulation (O(n) instead of O(n^2)
+            # bytes copied); 'or ""' guards against pages with no text layer.
+            # Pages are independent, and parts of the pdfminer decode path
+            # release the GIL, so multi-page invoices extract in parallel;
+            # short invoices skip the pool setup cost.
+            if len(pdf.pages) >= 4:
+                with ThreadPoolExecutor(max_workers=min(8, len(pdf.pages))) as ex:
+                    texts = list(ex.map(lambda page: page.extract_text() or "", pdf.pages))
+                return "\n".join(texts) + "\n"
+            return "\n".join((page.extract_text() or "") for page in pdf.pages) + "\n"
+
     @staticmethod
     def parse_bambu_invoice(pdf_bytes: bytes) -> Dict[str, any]:
         """
@@ -16,10 +199,13 @@ class InvoiceParser:
         - order_number: str
         - order_date: date
         - vendor: str ("Bambu Lab")
-        - items: List[Dict] with product details
+        - items: List[InvoiceItem] with product details
         """
-        import io
+        return InvoiceParser._parse_bambu_text(InvoiceParser._extract_full_text(pdf_bytes))
 
+    @staticmethod
+    def _parse_bambu_text(full_text: str) -> Dict[str, any]:
+        """Parse already-extracted Bambu Lab invoice text."""
         result = {
             "order_number": None,
             "order_date": None,
@@ -27,199 +213,84 @@ class InvoiceParser:
             "items": []
         }
 
-        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-            # Extract text from all pages
-            full_text = ""
-            for page in pdf.pages:
-                full_text += page.extract_text() + "\n"
-
-            # Extract order number
-            order_match = re.search(r"Order Number:\s*([A-Za-z0-9]+)", full_text)
-            if order_match:
-                result["order_number"] = order_match.group(1)
+        # Extract order number
+        order_match = _RE_BAMBU_ORDER_NUM.search(full_text)
+        if order_match:
+            result["order_number"] = order_match.group(1)
 
-            # Extract order date (use Invoice Date as proxy for purchase date)
-            date_match = re.search(r"Invoice Date:\s*(\d{4}-\d{2}-\d{2})", full_text)
-            if date_match:
-                result["order_date"] = datetime.strptime(date_match.group(1), "%Y-%m-%d").date()
+        # Extract order date (use Invoice Date as proxy for purchase date)
+        date_match = _RE_BAMBU_INVOICE_DATE.search(full_text)
+        if date_match:
+            result["order_date"] = datetime.strptime(date_match.group(1), "%Y-%m-%d").date()
 
-            # Parse product items - look for filament products
-            # Pattern: Product name, SKU, Variant, Qty, Price info
-            items = InvoiceParser._extract_bambu_products(full_text)
-            result["items"] = items
+        # Parse product items - look for filament products
+        # Pattern: Product name, SKU, Variant, Qty, Price info
+        result["items"] = InvoiceParser._extract_bambu_products(full_text)
 
         return result
 
     @staticmethod
-    def _extract_bambu_products(text: str) -> List[Dict]:
-        """Extract individual product items from Bambu invoice text."""
+    def _extract_bambu_products(text: str) -> List["InvoiceItem"]:
+        """Extract individual product items from Bambu invoice text.
+
+        A single compiled block pattern locates each item (product-name
+        line, optional continuation line, and the handful of follow-up
+        lines before the next product or the summary section); SKU,
+        quantity/price, and variant colour are then pulled from that small
+        block with anchored searches. This replaces the previous
+        hand-rolled line-index state machine with one pass over the text.
+        """
         items = []
 
-        # Split by lines and process sequentially
-        lines = [line.strip() for line in text.split("\n")]
-        i = 0
-
-        while i < len(lines):
-            line = lines[i]
-
-            # Look for filament product names (PLA, PETG, TPU, etc.)
-            # Handle various formats: "PLA Basic", "PLA Silk Multi-Color", "TPU for AMS", "PLA Tough+", etc.
-            # Also handle cases where product name might be split across lines
-            product_name = None
-            
-            # Check if current line starts with a material type
-            material_match = re.match(r"^(PLA|PETG|ABS|TPU|ASA)(\s+(Basic|Silk|Matte|Tough\+|Tough|Multi-Color|for AMS|HF))?", line, re.IGNORECASE)
-            
-            if material_match:
-                # Product name might be on this line or continue on next line
-                product_name = line
-                i += 1
-                
-                # Check if product name continues on next line (e.g., "PLA Silk" on one line, "Multi-Color" on next)
-                if i < len(lines) and not lines[i].startswith(("SKU:", "WA STATE", "TAX", "Variant:")):
-                    # Check if next line continues the product name
-                    next_line = lines[i]
-                    if re.match(r"^(Multi-Color|for AMS|HF)", next_line, re.IGNORECASE):
-                        product_name += " " + next_line
-                        i += 1
-            else:
-                i += 1
-                continue
-
-            if not product_name:
-                i += 1
-                continue
-
-            # Skip WA STATE TAX line
-            if i < len(lines) and "WA STATE" in lines[i]:
-                i += 1
-
-            # Next line should have SKU
+        for match in _RE_BAMBU_ITEM.finditer(text):
+            product_name = match.group("product").strip()
+            continuation = match.group("cont")
+            if continuation:
+                # Product name split across lines, e.g. "PLA Silk" / "Multi-Color"
+                product_name += " " + continuation.strip()
+            body = match.group("body") or ""
+
+            # One pass over the block classifies its lines:
+            # "SKU: A00-K0-1.75-1000", "SPLFREE 1 $19.99 ..." / "2 $23.99",
+            # "Variant: Orange (10300) / Refill /"; first hit of each kind wins
             sku = None
-            if i < len(lines) and lines[i].startswith("SKU:"):
-                sku_match = re.search(r"SKU:\s*([A-Z0-9-]+)", lines[i])
-                sku = sku_match.group(1) if sku_match else None
-                i += 1
-
-            # Skip TAX line
-            if i < len(lines) and "TAX" in lines[i] and "WA STATE" not in lines[i]:
-                i += 1
-
-            # Next line has quantity and prices
-            # Format: "SPLFREE 1 $19.99 $7.00 $1.22 $12.99" or "SPL 1 $24.99 $2.50 $2.11 $22.49"
-            # Sometimes quantity/price might be on same line as SKU or variant
             qty = 1
             price = None
-            
-            # Look ahead a few lines to find quantity/price
-            # Format variations:
-            # - "SPLFREE 1 $19.99 $7.00 $1.22 $12.99"
-            # - "SPL 1 $24.99 $2.50 $2.11 $22.49"  
-            # - "1 $24.99 $2.50 $2.11 $22.49" (no SPL prefix - PLA Silk, TPU, PLA Tough+)
-            # - "2 $23.99 $19.19 $2.70 $28.79" (PLA Tough+ with quantity 2)
-            for look_ahead in range(i, min(i + 5, len(lines))):
-                qty_price_line = lines[look_ahead]
-                # Try patterns: SPLFREE/SPL with qty/price, or just qty/price at start of line
-                # Match: "SPLFREE 1 $19.99" or "SPL 1 $24.99" or "1 $24.99" or "2 $23.99"
-                qty_match = re.search(r"^(?:SPL(?:FREE)?\s+)?(\d+)\s+\$(\d+\.\d+)", qty_price_line)
-                if qty_match:
-                    qty = int(qty_match.group(1))
-                    price = float(qty_match.group(2))
-                    i = look_ahead + 1
-                    break
-            else:
-                # If no quantity/price found, continue to next line
-                i += 1
-
-            # Skip WA CITY TAX line (if separate)
-            if i < len(lines) and lines[i] == "WA CITY" or (lines[i].startswith("WA CITY") and "TAX" not in lines[i]):
-                i += 1
-
-            # Next line(s) have variant info
-            # Format variations:
-            # - "Variant: Orange (10300) / Refill /"
-            # - "Variant: Dawn Radiance (13912) WA CITY"
-            # - "Variant: White (12107) / WA CITY"
-            # - Might be split across multiple lines
             color_name = None
-            variant_line = ""
-
-            # Collect variant info (might be across multiple lines)
-            # Look ahead up to 5 lines for variant information
-            for look_ahead in range(i, min(i + 5, len(lines))):
-                line = lines[look_ahead]
-                
-                # Stop if we hit a new product
-                if re.match(r"^(PLA|PETG|ABS|TPU|ASA)", line):
-                    break
-                    
-                # Stop if we hit summary sections
-                if line.startswith(("Items Subtotal", "Shipping", "Grand total", "Total exclude")):
-                    break
-                
-                # Collect variant line
-                if line.startswith("Variant:") or ("(" in line and ")" in line and not line.startswith("PLA")):
-                    variant_line += " " + line
-                    # Check if we have enough info (color name in parentheses)
-                    if "(" in variant_line and ")" in variant_line:
-                        i = look_ahead + 1
-                        break
-                elif variant_line and not line.startswith(("TAX", "WA STATE", "WA CITY", "SKU", "SPL")):
-                    # Continue collecting if we're in the middle of variant info
-                    variant_line += " " + line
-                    if "kg" in variant_line or ("(" in variant_line and ")" in variant_line):
-                        i = look_ahead + 1
-                        break
-            else:
-                i += 1
-
-            # Parse color from variant
-            color_match = re.search(r"Variant:\s*([^(]+?)\s*\(", variant_line)
-            if color_match:
-                color_name = color_match.group(1).strip()
-                # Clean up color name - remove trailing TAX, WA STATE, etc.
-                color_name = re.sub(r'\s+(TAX|WA STATE|WA CITY|Refill|Filament|with spool|/).*$', '', color_name, flags=re.IGNORECASE).strip()
-                # Remove extra whitespace
-                color_name = " ".join(color_name.split())
-
-            # Extract material type from product name
-            material = None
-            product_upper = product_name.upper()
-            
-            if "PLA" in product_upper:
-                if "SILK" in product_upper and "MULTI" in product_upper:
-                    material = "PLA SILK MULTI-COLOR"
-                elif "SILK" in product_upper:
-                    material = "PLA SILK"
-                elif "MATTE" in product_upper:
-                    material = "PLA MATTE"
-                elif "TOUGH+" in product_upper or "TOUGH" in product_upper:
-                    material = "PLA TOUGH+"
-                elif "BASIC" in product_upper:
-                    material = "PLA BASIC"
-                else:
-                    material = "PLA"
-            elif "PETG" in product_upper:
-                material = "PETG HF" if "HF" in product_upper else "PETG"
-            elif "ABS" in product_upper:
-                material = "ABS"
-            elif "TPU" in product_upper:
-                material = "TPU"
-            elif "ASA" in product_upper:
-                material = "ASA"
+            for line_match in _RE_BAMBU_BODY.finditer(body):
+                kind = line_match.lastgroup
+                if kind == "sku" and sku is None:
+                    sku = line_match.group("sku")
+                elif kind == "price" and price is None:
+                    qty = int(line_match.group("qty"))
+                    price = float(line_match.group("price"))
+                elif kind == "variant" and color_name is None:
+                    color_name = line_match.group("variant").strip()
+                    # Clean up color name - remove trailing TAX, WA STATE, etc.
+                    color_name = _RE_COLOR_CLEANUP.sub('', color_name).strip()
+                    # Remove extra whitespace
+                    color_name = " ".join(color_name.split())
+
+            # Extract material type from product name: tokenize once, then
+            # C-level subset tests against the ordered rule table
+            tokens = frozenset(product_name.upper().replace("-", " ").split())
+            material = next(
+                (name for needed, name in _BAMBU_MATERIAL_RULES if needed <= tokens),
+                None,
+            )
 
             # Only add if we have essential info
             if material and color_name:
-                items.append({
-                    "brand": "Bambu Lab",
-                    "material": material,
-                    "color_name": color_name,
-                    "diameter_mm": 1.75,  # Bambu standard
-                    "sku": sku,
-                    "quantity": qty,
-                    "price": price,
-                    "product_line": product_name
-                })
+                items.append(InvoiceItem(
+                    brand="Bambu Lab",
+                    material=material,
+                    color_name=color_name,
+                    diameter_mm=1.75,  # Bambu standard
+                    sku=sku,
+                    quantity=qty,
+                    price=price,
+                    product_line=product_name,
+                ))
 
         return items
 
@@ -227,210 +298,191 @@ class InvoiceParser:
     def parse_amazon_invoice(pdf_bytes: bytes) -> Dict[str, any]:
         """
         Parse Amazon invoice PDF.
-        
+
         Returns dict with:
         - order_number: str
         - order_date: date
         - vendor: str ("Amazon")
-        - items: List[Dict] with product details
+        - items: List[InvoiceItem] with product details
         """
-        import io
-        
+        return InvoiceParser._parse_amazon_text(InvoiceParser._extract_full_text(pdf_bytes))
+
+    @staticmethod
+    def _parse_amazon_text(full_text: str) -> Dict[str, any]:
+        """Parse already-extracted Amazon invoice text."""
         result = {
             "order_number": None,
             "order_date": None,
             "vendor": "Amazon",
             "items": []
         }
-        
-        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-            full_text = ""
-            for page in pdf.pages:
-                full_text += page.extract_text() + "\n"
-                
-            # Extract order number
-            # Pattern: Order # 112-3645497-2433833
-            order_match = re.search(r"Order #\s*(\d{3}-\d{7}-\d{7})", full_text)
-            if order_match:
-                result["order_number"] = order_match.group(1)
-                
-            # Extract order date
-            # Pattern: Order placed November 23, 2025
-            date_match = re.search(r"Order placed\s+([A-Za-z]+\s+\d{1,2},\s+\d{4})", full_text)
-            if date_match:
-                try:
-                    date_str = date_match.group(1)
-                    result["order_date"] = datetime.strptime(date_str, "%B %d, %Y").date()
-                except ValueError:
-                    pass
-                    
-            # Extract items
-            # Amazon Order Details PDF structure is block-based.
-            # We'll look for price patterns and backtrack to find product details
-            result["items"] = InvoiceParser._extract_amazon_products(full_text)
-            
+
+        # Extract order number
+        # Pattern: Order # 112-3645497-2433833
+        order_match = _RE_AMAZON_ORDER.search(full_text)
+        if order_match:
+            result["order_number"] = order_match.group(1)
+
+        # Extract order date
+        # Pattern: Order placed November 23, 2025
+        date_match = _RE_AMAZON_DATE.search(full_text)
+        if date_match:
+            try:
+                date_str = date_match.group(1)
+                result["order_date"] = datetime.strptime(date_str, "%B %d, %Y").date()
+            except ValueError:
+                pass
+
+        # Extract items
+        # Amazon Order Details PDF structure is block-based.
+        # We'll look for price patterns and backtrack to find product details
+        result["items"] = InvoiceParser._extract_amazon_products(full_text)
+
         return result
 
     @staticmethod
-    def _extract_amazon_products(text: str) -> List[Dict]:
-        """Extract product items from Amazon invoice text."""
+    def _extract_amazon_products(text: str) -> List["InvoiceItem"]:
+        """Extract product items from Amazon invoice text.
+
+        Amazon Order Details PDFs are block-based: a few description
+        lines, a "Sold by:" line, then the price on its own line. One
+        forward pass records the landmark lines (prices, sellers,
+        header/footer markers); each item's description is then the
+        slice between its nearest preceding landmark and its seller
+        line, found by bisection instead of nested backtrack loops.
+        """
         items = []
         lines = [line.strip() for line in text.split("\n") if line.strip()]
-        
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            
-            # Look for price line which marks end of an item block usually
-            # Format: $19.97 or $13.03
-            price_match = re.match(r"^\$(\d+\.\d{2})$", line)
-            
+
+        prices = []  # (line index, price)
+        seller_indices = []
+        boundaries = []  # lines that terminate a description slice
+        for idx, line in enumerate(lines):
+            price_match = _RE_PRICE_LINE.match(line)
             if price_match:
-                price = float(price_match.group(1))
-                
-                # Backtrack to find product description
-                # Usually: 
-                # [Product Description lines...]
-                # Sold by: ...
-                # Return or replace items: ...
-                # $Price
-                
-                # Look back for "Sold by:"
-                sold_by_idx = -1
-                for j in range(i - 1, max(-1, i - 10), -1):
-                    if lines[j].startswith("Sold by:") or lines[j].startswith("Supplied by:"):
-                        sold_by_idx = j
-                        break
-                
-                if sold_by_idx != -1:
-                    # Product description is before "Sold by"
-                    # It might be 1-4 lines (Amazon descriptions can be long)
-                    description_lines = []
-                    # Go back from sold_by_idx until we hit a date, price, or another known marker
-                    # or just take the previous 2-4 lines which usually contain the title
-                    
-                    # Simple heuristic: Take lines above Sold by, stopping if we see:
-                    # - Delivered/Order placed (header info)
-                    # - Return or replace (next item's footer)
-                    # - Order # (header)
-                    # - Another price line (previous item)
-                    for k in range(sold_by_idx - 1, max(-1, sold_by_idx - 6), -1):
-                        prev_line = lines[k]
-                        # Stop if we hit header/footer markers
-                        if (prev_line.startswith("Delivered") or 
-                            "Order placed" in prev_line or 
-                            prev_line.startswith("Return or replace") or
-                            prev_line.startswith("Order #") or
-                            prev_line.startswith("Supplied by:")):
-                            break
-                        # Stop if we hit another price (previous item)
-                        if re.match(r"^\$(\d+\.\d{2})$", prev_line):
-                            break
-                        description_lines.insert(0, prev_line)
-                    
-                    full_description = " ".join(description_lines).strip()
-                    
-                    # Clean up: Remove any leading price that might have been included
-                    full_description = re.sub(r'^\$\d+\.\d{2}\s+', '', full_description)
-                    
-                    # Check if it's a filament
-                    if "filament" in full_description.lower() or "pla" in full_description.lower() or "petg" in full_description.lower():
-                        item_data = InvoiceParser._parse_amazon_filament_description(full_description, price)
-                        if item_data:
-                            items.append(item_data)
-                            
-            i += 1
-            
+                prices.append((idx, float(price_match.group(1))))
+                boundaries.append(idx)
+            elif line.startswith(_AMZ_SELLER_PREFIXES):
+                seller_indices.append(idx)
+                if line.startswith(_AMZ_STOP_PREFIXES):
+                    boundaries.append(idx)
+            elif line.startswith(_AMZ_STOP_PREFIXES) or "Order placed" in line:
+                boundaries.append(idx)
+
+        for price_idx, price in prices:
+            # Nearest "Sold by:"/"Supplied by:" above the price line
+            pos = bisect_right(seller_indices, price_idx) - 1
+            if pos < 0:
+                continue
+            sold_by_idx = seller_indices[pos]
+            if sold_by_idx < price_idx - 9:
+                continue
+
+            # Description: the lines between the last boundary (previous
+            # item's price, header/footer marker) and the seller line,
+            # capped at 5 lines as Amazon titles rarely wrap further.
+            bpos = bisect_right(boundaries, sold_by_idx - 1) - 1
+            start = boundaries[bpos] + 1 if bpos >= 0 else 0
+            start = max(start, sold_by_idx - 5)
+            full_description = " ".join(lines[start:sold_by_idx]).strip()
+
+            # Clean up: Remove any leading price that might have been included
+            full_description = _RE_LEADING_PRICE.sub('', full_description)
+
+            # Check if it's a filament; lowercase once and reuse downstream
+            desc_lower = full_description.lower()
+            if any(keyword in desc_lower for keyword in _AMZ_FILAMENT_KEYWORDS):
+                item_data = InvoiceParser._parse_amazon_filament_description(
+                    full_description, price, desc_lower
+                )
+                if item_data:
+                    items.append(item_data)
+
         return items
 
     @staticmethod
-    def _parse_amazon_filament_description(description: str, price: float) -> Optional[Dict]:
-        """Parse Amazon product description string into structured data."""
-        desc_lower = description.lower()
-        
-        # Brand detection
+    def _parse_amazon_filament_description(
+        description: str, price: float, desc_lower: Optional[str] = None
+    ) -> Optional["InvoiceItem"]:
+        """Parse Amazon product description string into structured data.
+
+        Callers that already lowercased the description can pass it in to
+        avoid recomputing it.
+        """
+        if desc_lower is None:
+            desc_lower = description.lower()
+
+        # Brand detection (one scan; priority order matches the old cascade)
         brand = "Unknown"
-        if "esun" in desc_lower:
-            brand = "eSUN"
-        elif "sunlu" in desc_lower:
-            brand = "Sunlu"
-        elif "overture" in desc_lower:
-            brand = "Overture"
-        elif "polymaker" in desc_lower:
-            brand = "Polymaker"
-        elif "hatchbox" in desc_lower:
-            brand = "Hatchbox"
-        elif "bambu" in desc_lower:
-            brand = "Bambu Lab"
-            
+        found_brands = set(_RE_AMZ_BRAND.findall(desc_lower))
+        if found_brands:
+            for needle, canonical in _AMZ_BRANDS:
+                if needle in found_brands:
+                    brand = canonical
+                    break
+
         # Material detection
         material = "PLA"  # Default
-        if "pla+" in desc_lower or "pla plus" in desc_lower:
-            material = "PLA+"
-        elif "pla matte" in desc_lower or "matte pla" in desc_lower:
-            material = "PLA Matte"
-        elif "pla silk" in desc_lower or "silk pla" in desc_lower:
-            material = "PLA Silk"
-        elif "pla" in desc_lower:
-            material = "PLA"
-        elif "petg" in desc_lower:
-            material = "PETG"
-        elif "tpu" in desc_lower:
-            material = "TPU"
-        elif "abs" in desc_lower:
-            material = "ABS"
-        elif "asa" in desc_lower:
-            material = "ASA"
-            
+        found_materials = set(_RE_AMZ_MATERIAL.findall(desc_lower))
+        if found_materials:
+            for needle, canonical in _AMZ_MATERIALS:
+                if needle in found_materials:
+                    material = canonical
+                    break
+
         # Color detection
         # Look for color name usually at end or separated by commas
         # Heuristic: Look for common color names
-        colors = [
-            "black", "white", "grey", "gray", "red", "blue", "green", "yellow", 
-            "orange", "purple", "pink", "gold", "silver", "copper", "brown", "pine green",
-            "deep black", "cold white", "cool white"
-        ]
-        
         color_name = "Unknown"
-        found_colors = []
-        for c in colors:
-            if c in desc_lower:
-                found_colors.append(c)
-        
-        if found_colors:
-            # Pick the longest match (e.g., "deep black" over "black")
-            color_name = max(found_colors, key=len).title()
+        for color in _AMZ_COLORS_SORTED:
+            if color in desc_lower:
+                color_name = color.title()
+                break
             
         # Diameter
         diameter = 1.75
         if "2.85" in description:
             diameter = 2.85
             
-        return {
-            "brand": brand,
-            "material": material,
-            "color_name": color_name,
-            "diameter_mm": diameter,
-            "sku": None, # Amazon doesn't easily show SKU in description
-            "quantity": 1, # Assumed 1 unless parsed otherwise
-            "price": price,
-            "product_line": description[:50] + "..." # Truncate for reference
-        }
+        return InvoiceItem(
+            brand=brand,
+            material=material,
+            color_name=color_name,
+            diameter_mm=diameter,
+            sku=None,  # Amazon doesn't easily show SKU in description
+            quantity=1,  # Assumed 1 unless parsed otherwise
+            price=price,
+            product_line=description[:50] + "...",  # Truncate for reference
+        )
+
+    @staticmethod
+    def _detect_vendor_from_text(text: str) -> Optional[str]:
+        """Detect the invoice vendor from already-extracted text."""
+        # The vendor name appears in the header, so the first couple of KB
+        # is plenty
+        text_lower = text[:2048].lower()
+
+        for needle, vendor in _VENDOR_NEEDLES:
+            if needle in text_lower:
+                return vendor
+
+        return None
 
     @staticmethod
     def detect_vendor(pdf_bytes: bytes) -> Optional[str]:
         """Detect which vendor an invoice is from based on PDF content."""
-        import io
+        # Cheap sniff before spinning up the PDF machinery at all
+        if not pdf_bytes.startswith(b"%PDF"):
+            return None
 
-        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-            first_page_text = pdf.pages[0].extract_text() if pdf.pages else ""
+        # Only a raw text probe of page 1 is needed here — no layout analysis
+        with _open_pdf(pdf_bytes, laparams=None) as pdf:
+            first_page_text = (
+                pdf.pages[0].extract_text(x_tolerance=3, y_tolerance=3, layout=False)
+                if pdf.pages else ""
+            )
 
-            if "bambulab" in first_page_text.lower() or "bambu lab" in first_page_text.lower():
-                return "bambu"
-            elif "amazon" in first_page_text.lower():
-                return "amazon"
-
-        return None
+        return InvoiceParser._detect_vendor_from_text(first_page_text or "")
 
     @staticmethod
     def parse_invoice(pdf_bytes: bytes) -> Dict[str, any]:
@@ -438,12 +490,61 @@ class InvoiceParser:
         Auto-detect vendor and parse invoice accordingly.
 
         Returns dict with order info and extracted items.
+
+        The PDF is opened and its text extracted exactly once; vendor
+        detection and parsing both operate on that text. Results are
+        memoized by content hash, so re-submitting the same bytes
+        (retries, UI re-renders) skips the whole pdfplumber pipeline.
         """
-        vendor = InvoiceParser.detect_vendor(pdf_bytes)
-
-        if vendor == "bambu":
-            return InvoiceParser.parse_bambu_invoice(pdf_bytes)
-        elif vendor == "amazon":
-            return InvoiceParser.parse_amazon_invoice(pdf_bytes)
-        else:
-            raise ValueError("Unknown or unsupported invoice vendor")
+        digest = hashlib.blake2b(pdf_bytes, digest_size=16).digest()
+        with _invoice_cache_lock:
+            cached = _INVOICE_CACHE.get(digest)
+            if cached is not None:
+                _INVOICE_CACHE.move_to_end(digest)
+                # Deep copy so callers can't mutate the cached result
+                return copy.deepcopy(cached)
+
+        result = _parse_invoice_uncached(pdf_bytes)
+
+        with _invoice_cache_lock:
+            _INVOICE_CACHE[digest] = result
+            _INVOICE_CACHE.move_to_end(digest)
+            while len(_INVOICE_CACHE) > _INVOICE_CACHE_MAX:
+                _INVOICE_CACHE.popitem(last=False)
+        return copy.deepcopy(result)
+
+# Vendor detection needles, checked in order; adding a vendor means one
+# entry here plus a parser in _TEXT_PARSERS, not another if/elif branch.
+_VENDOR_NEEDLES = (
+    ("bambulab", "bambu"),
+    ("bambu lab", "bambu"),
+    ("amazon", "amazon"),
+)
+
+# vendor tag -> text parser, resolved in one hash lookup
+_TEXT_PARSERS = {
+    "bambu": InvoiceParser._parse_bambu_text,
+    "amazon": InvoiceParser._parse_amazon_text,
+}
+
+# Memoized parse results keyed by content digest; only digests and result
+# dicts live here, never the PDF bytes themselves. A plain bounded LRU (the
+# same OrderedDict-under-a-lock pattern as ocr_service's _OCR_CACHE) so the
+# bytes are passed to the parse explicitly — no side-channel handoff that
+# would race under concurrent identical uploads. Failed parses raise and
+# are never cached.
+_INVOICE_CACHE: "OrderedDict[bytes, Dict[str, any]]" = OrderedDict()
+_INVOICE_CACHE_MAX = 128
+_invoice_cache_lock = threading.Lock()
+
+
+def _parse_invoice_uncached(pdf_bytes: bytes) -> Dict[str, any]:
+    """Extract the invoice text once and parse it with the vendor's parser."""
+    full_text = InvoiceParser._extract_full_text(pdf_bytes)
+    vendor = InvoiceParser._detect_vendor_from_text(full_text)
+
+    try:
+        parser = _TEXT_PARSERS[vendor]
+    except KeyError:
+        raise ValueError("Unknown or unsupported invoice vendor") from None
+    return parser(full_text)
@@ -1,12 +1,23 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
-from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
-from fastapi import Depends, FastAPI, HTTPException, UploadFile, File
+from fastapi import Depends, FastAPI, HTTPException, Query, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from sqlmodel import Session, select, SQLModel
-
-from backend.database import get_session, init_db
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import noload
+from sqlmodel import select, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.database import async_engine, engine, get_session, init_async_db, init_db
+from backend.google_sheets import GoogleSheetsExporter, GoogleSheetsError
 from backend.models import (
     Product,
     ProductCreate,
@@ -17,83 +28,45 @@ from backend.models import (
     SpoolDetail,
     SpoolUpdate,
 )
-from backend.ocr_service import LabelParser
+from backend.ocr_service import LabelParser, OCRError
 from backend.invoice_parser import InvoiceParser
-
-
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Lifespan context manager for startup/shutdown events."""
-    # Startup
-    init_db()
-    yield
-    # Shutdown (if needed in future)
-
-
-app = FastAPI(
-    title="3D Filament Scanner API",
-    version="1.0.0",
-    lifespan=lifespan
-)
-
-# Add CORS middleware for frontend
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Will restrict to frontend domain after deployment
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+from backend.validation import (
+    validate_image_file,
+    validate_pdf_file,
+    ValidationError,
 )
 
 
-@app.get("/", tags=["health"])
-def read_root() -> dict[str, str]:
-    return {"status": "ok"}
-
+def _probe_ocr() -> dict:
+    """Probe Tesseract availability and run a tiny test OCR.
 
-@app.get("/api/v1/health/ocr", tags=["health"])
-def health_ocr() -> dict:
-    """
-    Health check endpoint for OCR service.
-    
-    Returns:
-    - status: "ok" or "error"
-    - tesseract_available: Whether Tesseract is installed
-    - tesseract_version: Tesseract version if available
-    - test_result: Result of test OCR operation
+    Executed once at startup; uptime monitors polling the OCR health
+    endpoint shouldn't launch a Tesseract subprocess on every request.
     """
-    from backend.ocr_service import LabelParser, OCRError
-    
     result = {
         "status": "ok",
         "tesseract_available": False,
         "tesseract_version": None,
         "test_result": None
     }
-    
+
     # Check Tesseract availability
     try:
         import pytesseract
         version = pytesseract.get_tesseract_version()
         result["tesseract_available"] = True
-        result["tesseract_version"] = version
-        
+        result["tesseract_version"] = str(version)
+
         # Try a simple test OCR (create a small test image)
         try:
-            from PIL import Image, ImageDraw, ImageFont
-            import io
-            
+            from PIL import Image, ImageDraw
+
             # Create a simple test image with text
             img = Image.new('RGB', (200, 50), color='white')
             draw = ImageDraw.Draw(img)
             # Draw simple text
             draw.text((10, 10), "TEST", fill='black')
-            
-            # Convert to bytes
-            img_bytes = io.BytesIO()
-            img.save(img_bytes, format='PNG')
-            img_bytes.seek(0)
-            
+
             # Try OCR
             test_text = pytesseract.image_to_string(img, config='--psm 7')
             result["test_result"] = {
@@ -106,34 +79,276 @@ def health_ocr() -> dict:
                 "error": str(e)
             }
             result["status"] = "warning"
-            
+
     except Exception as e:
         result["status"] = "error"
         result["error"] = str(e)
-    
+
+    return result
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Lifespan context manager for startup/shutdown events."""
+    # Startup
+    init_db()
+    await init_async_db()
+    # Start cold: entries cached by a previous boot of this module may
+    # describe a database that has since been dropped or swapped
+    _read_cache.clear()
+    for namespace in _cache_generations:
+        _cache_generations[namespace] = 0
+    app.state.ocr_health = _probe_ocr()
+    # CPU-bound parsing (Tesseract OCR, PDF layout analysis) runs in a
+    # process pool so the event loop stays responsive while it grinds
+    app.state.parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    yield
+    # Shutdown
+    app.state.parse_pool.shutdown()
+
+
+app = FastAPI(
+    title="3D Filament Scanner API",
+    version="1.0.0",
+    lifespan=lifespan,
+    # orjson serializes the large listing payloads several times faster
+    # than the stdlib encoder
+    default_response_class=ORJSONResponse,
+)
+
+# Add CORS middleware for frontend. Explicit origin/method/header lists
+# plus max_age let browsers cache the preflight for a day instead of
+# re-validating per request ("*" with credentials is also spec-invalid).
+FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://localhost:3000")
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=[FRONTEND_URL],
+    allow_credentials=True,
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
+)
+
+# Compress sizable JSON responses (spool/product listings); tiny payloads
+# aren't worth the CPU, hence the minimum size threshold
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=5)
+
+# Upload size caps by route, enforced before the handler buffers the body.
+# validate_image_file/validate_pdf_file still run afterwards for
+# content-sniff validation; these limits mirror theirs.
+_UPLOAD_BODY_LIMITS = {
+    "/api/v1/ocr/parse-label": 10 * 1024 * 1024,
+    "/api/v1/invoice/parse": 20 * 1024 * 1024,
+    "/api/v1/invoice/import": 20 * 1024 * 1024,
+}
+
+
+class BodySizeLimitMiddleware:
+    """Reject oversized uploads without buffering them.
+
+    A declared Content-Length over the route's limit is refused outright;
+    chunked uploads are cut off at the first byte past the limit instead
+    of being read fully into memory before validation rejects them.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = _UPLOAD_BODY_LIMITS.get(scope["path"])
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if int(value) > limit:
+                    await self._reject(scope, receive, send, limit)
+                    return
+                break
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Surfaces through the handlers' HTTPException
+                    # pass-throughs as a 413 response
+                    raise HTTPException(
+                        status_code=413, detail=self._detail(limit)
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    async def _reject(self, scope, receive, send, limit: int) -> None:
+        response = ORJSONResponse(status_code=413, content={"detail": self._detail(limit)})
+        await response(scope, receive, send)
+
+    @staticmethod
+    def _detail(limit: int) -> dict:
+        return {
+            "error": "Payload too large",
+            "message": f"Request body exceeds the {limit // (1024 * 1024)} MB limit for this endpoint",
+        }
+
+
+app.add_middleware(BodySizeLimitMiddleware)
+
+# In-process TTL cache for the read-heavy GET endpoints. The deployment runs
+# a single uvicorn process, so a process-local dict behaves like a tiny Redis
+# without the extra service: hot reads skip the database for up to
+# _CACHE_TTL_SECONDS, and every mutation bumps its namespace generation so a
+# stale entry is never served after a write.
+_CACHE_TTL_SECONDS = 30.0
+_CACHE_MAX_ENTRIES = 256
+
+_read_cache: Dict[tuple, tuple] = {}
+_cache_generations: Dict[str, int] = {"products": 0, "spools": 0}
+
+
+def _cache_get(namespace: str, key: tuple):
+    entry = _read_cache.get((namespace, _cache_generations[namespace], key))
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if time.monotonic() >= expires_at:
+        return None
+    return value
+
+
+def _evict_stale_cache_entries() -> None:
+    """Drop expired and old-generation entries (they can never be served)."""
+    now = time.monotonic()
+    stale = [
+        full_key
+        for full_key, (expires_at, _) in _read_cache.items()
+        if now >= expires_at or full_key[1] != _cache_generations[full_key[0]]
+    ]
+    for full_key in stale:
+        del _read_cache[full_key]
+
+
+def _cache_put(namespace: str, key: tuple, value):
+    if len(_read_cache) >= _CACHE_MAX_ENTRIES:
+        # Prefer shedding dead weight over wiping hot entries; the wholesale
+        # clear only fires if the cache is genuinely full of live entries
+        _evict_stale_cache_entries()
+        if len(_read_cache) >= _CACHE_MAX_ENTRIES:
+            _read_cache.clear()
+    full_key = (namespace, _cache_generations[namespace], key)
+    _read_cache[full_key] = (time.monotonic() + _CACHE_TTL_SECONDS, value)
+    return value
+
+
+def _invalidate_cache(*namespaces: str) -> None:
+    for namespace in namespaces:
+        _cache_generations[namespace] += 1
+
+
+# Parent-side memo for pool-dispatched parses, keyed by content digest.
+# The parsers keep their own caches, but those live per worker process:
+# with max_workers at CPU count a duplicate upload usually lands on a
+# different worker and misses. Checking here, before dispatch, makes a
+# duplicate upload skip the pool (and OCR/pdfplumber) entirely. Single
+# event loop, so no lock; results are copied on the way in and out since
+# the endpoints decorate them with validation metadata.
+_PARSE_RESULT_CACHE: "OrderedDict[tuple, Dict]" = OrderedDict()
+_PARSE_RESULT_CACHE_MAX = 128
+
+
+async def _run_parse_cached(kind: str, parse_func: Callable, payload: bytes) -> Dict:
+    """Run a CPU-bound parse in the pool unless its result is memoized."""
+    key = (kind, hashlib.blake2b(payload, digest_size=16).digest())
+    cached = _PARSE_RESULT_CACHE.get(key)
+    if cached is not None:
+        _PARSE_RESULT_CACHE.move_to_end(key)
+        return dict(cached)
+
+    result = await asyncio.get_running_loop().run_in_executor(
+        app.state.parse_pool, parse_func, payload
+    )
+    # Failed parses either raise (invoices) or carry an "error" key (OCR);
+    # only successes are worth pinning
+    if "error" not in result:
+        _PARSE_RESULT_CACHE[key] = dict(result)
+        while len(_PARSE_RESULT_CACHE) > _PARSE_RESULT_CACHE_MAX:
+            _PARSE_RESULT_CACHE.popitem(last=False)
     return result
 
 
+# Product fields embedded in joined spool payloads
+_PRODUCT_SUMMARY_FIELDS = {"brand", "line", "material", "color_name", "diameter_mm"}
+
+
+@app.get("/", tags=["health"])
+def read_root() -> dict[str, str]:
+    return {"status": "ok"}
+
+
+@app.get("/api/v1/health/ocr", tags=["health"])
+def health_ocr() -> dict:
+    """
+    Health check endpoint for OCR service.
+
+    Returns the probe computed once at startup:
+    - status: "ok", "warning", or "error"
+    - tesseract_available: Whether Tesseract is installed
+    - tesseract_version: Tesseract version if available
+    - test_result: Result of test OCR operation
+    """
+    return app.state.ocr_health
+
+
+@app.get("/debug/pool", tags=["health"])
+def pool_status() -> dict:
+    """Connection pool counters for validating pool sizing under load."""
+    return {
+        "sync": engine.pool.status(),
+        "async": async_engine.pool.status(),
+    }
+
+
 # Product Endpoints
 @app.post("/api/v1/products", response_model=Product, tags=["products"])
-def create_product(
-    product_in: ProductCreate, session: Session = Depends(get_session)
+async def create_product(
+    product_in: ProductCreate, session: AsyncSession = Depends(get_session)
 ) -> Product:
     product = Product(**product_in.model_dump())
     session.add(product)
-    session.commit()
-    session.refresh(product)
+    await session.commit()
+    await session.refresh(product)
+    # Joined spool listings embed product fields, so both namespaces go
+    _invalidate_cache("products", "spools")
     return product
 
 
-@app.get("/api/v1/products", response_model=List[Product], tags=["products"])
-def list_products(
+@app.get("/api/v1/products", tags=["products"])
+async def list_products(
     brand: Optional[str] = None,
     material: Optional[str] = None,
     color_name: Optional[str] = None,
-    session: Session = Depends(get_session)
-) -> List[Product]:
-    """List products with optional filtering by brand, material, and color_name."""
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    session: AsyncSession = Depends(get_session)
+) -> Dict:
+    """List products with optional filtering by brand, material, and color_name.
+
+    Paginated: returns {"items", "total", "limit", "offset"} so one bad
+    request can't pull the whole table, and the frontend can page.
+    """
+    cache_key = (brand, material, color_name, limit, offset)
+    cached = _cache_get("products", cache_key)
+    if cached is not None:
+        return cached
+
     query = select(Product)
 
     if brand:
@@ -143,57 +358,67 @@ def list_products(
     if color_name:
         query = query.where(Product.color_name.ilike(f"%{color_name}%"))
 
-    products = session.exec(query).all()
-    return products
+    total = (await session.exec(
+        select(func.count()).select_from(query.subquery())
+    )).one()
+    products = (await session.exec(
+        query.order_by(Product.id).offset(offset).limit(limit)
+    )).all()
+    page = {"items": products, "total": total, "limit": limit, "offset": offset}
+    return _cache_put("products", cache_key, page)
 
 
 @app.get("/api/v1/products/{product_id}", response_model=Product, tags=["products"])
-def get_product(product_id: int, session: Session = Depends(get_session)) -> Product:
-    product = session.get(Product, product_id)
+async def get_product(product_id: int, session: AsyncSession = Depends(get_session)) -> Product:
+    cached = _cache_get("products", ("item", product_id))
+    if cached is not None:
+        return cached
+
+    product = await session.get(Product, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    return _cache_put("products", ("item", product_id), product)
 
 
 @app.put("/api/v1/products/{product_id}", response_model=Product, tags=["products"])
-def update_product(
+async def update_product(
     product_id: int,
     product_in: ProductUpdate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ) -> Product:
-    product = session.get(Product, product_id)
+    product = await session.get(Product, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
     update_data = product_in.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(product, key, value)
-    product.updated_at = datetime.now(timezone.utc)
 
     session.add(product)
-    session.commit()
-    session.refresh(product)
+    await session.commit()
+    await session.refresh(product)
+    _invalidate_cache("products", "spools")
     return product
 
 
 @app.delete("/api/v1/products/{product_id}", status_code=204, tags=["products"])
-def delete_product(product_id: int, session: Session = Depends(get_session)) -> None:
-    product = session.get(Product, product_id)
+async def delete_product(product_id: int, session: AsyncSession = Depends(get_session)) -> None:
+    product = await session.get(Product, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    session.delete(product)
-    session.commit()
+    await session.delete(product)
+    await session.commit()
+    _invalidate_cache("products", "spools")
 
 
 # Spool Endpoints
 @app.post("/api/v1/spools", response_model=Spool, tags=["spools"])
-def create_spool(spool_in: SpoolCreate, session: Session = Depends(get_session)) -> Spool:
+async def create_spool(spool_in: SpoolCreate, session: AsyncSession = Depends(get_session)) -> Spool:
     spool = Spool(**spool_in.model_dump())
     session.add(spool)
-    session.commit()
-    session.refresh(spool)
+    await session.flush()  # Assigns spool.id for the change log
 
-    # Record initial state for audit trail
+    # Record initial state for audit trail; one commit covers both rows
     change_log = SpoolChangeLog(
         spool_id=spool.id,
         to_status=spool.status,
@@ -201,22 +426,36 @@ def create_spool(spool_in: SpoolCreate, session: Session = Depends(get_session))
         note="Spool created",
     )
     session.add(change_log)
-    session.commit()
+    await session.commit()
+    # Timestamps are DB-generated; fetch them for the response
+    await session.refresh(spool)
 
+    _invalidate_cache("spools")
     return spool
 
 
-@app.get("/api/v1/spools", response_model=List[Spool], tags=["spools"])
-def list_spools(
+@app.get("/api/v1/spools", tags=["spools"])
+async def list_spools(
     brand: Optional[str] = None,
     material: Optional[str] = None,
     color_name: Optional[str] = None,
     storage_location: Optional[str] = None,
     status: Optional[str] = None,
-    session: Session = Depends(get_session)
-) -> List[Spool]:
-    """List spools with optional filtering by status, product metadata, and storage location."""
-    query = select(Spool)
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    session: AsyncSession = Depends(get_session)
+) -> Dict:
+    """List spools with optional filtering by status, product metadata, and storage location.
+
+    Paginated like list_products: {"items", "total", "limit", "offset"}.
+    """
+    cache_key = (brand, material, color_name, storage_location, status, limit, offset)
+    cached = _cache_get("spools", cache_key)
+    if cached is not None:
+        return cached
+
+    # Plain spool rows only; skip the relationship eager loads
+    query = select(Spool).options(noload(Spool.product), noload(Spool.change_logs))
 
     # Join with product table when product filters are used
     if any([brand, material, color_name]):
@@ -233,77 +472,91 @@ def list_spools(
     if storage_location:
         query = query.where(Spool.storage_location.ilike(f"%{storage_location}%"))
 
-    spools = session.exec(query).all()
-    return spools
+    total = (await session.exec(
+        select(func.count()).select_from(query.subquery())
+    )).one()
+    spools = (await session.exec(
+        query.order_by(Spool.id).offset(offset).limit(limit)
+    )).all()
+    page = {"items": spools, "total": total, "limit": limit, "offset": offset}
+    return _cache_put("spools", cache_key, page)
 
 
 @app.get("/api/v1/spools/with-products", tags=["spools"])
-def list_spools_with_products(
+async def list_spools_with_products(
     status: Optional[str] = None,
-    session: Session = Depends(get_session)
-) -> List[Dict]:
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    session: AsyncSession = Depends(get_session)
+) -> Dict:
     """List spools with product information included (for Google Sheets export)."""
-    query = select(Spool)
-    
+    cache_key = ("with-products", status, limit, offset)
+    cached = _cache_get("spools", cache_key)
+    if cached is not None:
+        return cached
+
+    # One joined statement, streamed in server-side batches: rows are turned
+    # into dicts as they arrive instead of materializing the full ORM result
+    # first (selectinload can't stream, so the join is explicit)
+    query = (
+        select(Spool, Product)
+        .join(Product, isouter=True)
+        # Product comes from the explicit join and logs aren't serialized
+        # here; skip the relationship eager loads
+        .options(noload(Spool.product), noload(Spool.change_logs))
+        .execution_options(yield_per=500)
+    )
+
     if status:
         query = query.where(Spool.status == status)
-    
-    spools = session.exec(query).all()
-    
-    # Get all product IDs
-    product_ids = {spool.product_id for spool in spools}
-    
-    # Fetch products
-    products = {}
-    if product_ids:
-        product_query = select(Product).where(Product.id.in_(product_ids))
-        product_list = session.exec(product_query).all()
-        products = {p.id: p for p in product_list}
-    
-    # Combine spool and product data
+
+    total = (await session.exec(
+        select(func.count()).select_from(query.subquery())
+    )).one()
+    query = query.order_by(Spool.id).offset(offset).limit(limit)
+
+    rows = await session.stream(query)
+
+    # Combine spool and product data. model_dump(mode="json") encodes
+    # dates and enums in pydantic-core instead of per-field Python branches.
     result = []
-    for spool in spools:
-        product = products.get(spool.product_id)
-        spool_dict = {
-            "id": spool.id,
-            "product_id": spool.product_id,
-            "purchase_date": spool.purchase_date.isoformat() if spool.purchase_date else None,
-            "vendor": spool.vendor,
-            "price": spool.price,
-            "storage_location": spool.storage_location,
-            "status": spool.status.value,
-            "created_at": spool.created_at.isoformat() if spool.created_at else None,
-            "updated_at": spool.updated_at.isoformat() if spool.updated_at else None,
-        }
+    async for spool, product in rows:
+        spool_dict = spool.model_dump(mode="json")
+        spool_dict["product"] = product.model_dump(
+            mode="json", include=_PRODUCT_SUMMARY_FIELDS
+        ) if product else None
         result.append(spool_dict)
-    
-    return result
+
+    page = {"items": result, "total": total, "limit": limit, "offset": offset}
+    return _cache_put("spools", cache_key, page)
 
 
-def _build_spool_detail(spool: Spool, session: Session) -> SpoolDetail:
-    change_logs = session.exec(
-        select(SpoolChangeLog)
-        .where(SpoolChangeLog.spool_id == spool.id)
-        .order_by(SpoolChangeLog.created_at.desc())
-    ).all()
+async def _get_spool_with_logs(spool_id: int, session: AsyncSession) -> Optional[Spool]:
+    """Fetch a spool with product and change history.
+
+    The relationships are configured eager (joined/selectin), so the
+    history arrives ordered without a hand-written query here.
+    """
+    return await session.get(Spool, spool_id)
 
-    spool_data = spool.model_dump()
-    return SpoolDetail.model_validate({**spool_data, "change_logs": change_logs})
+
+def _build_spool_detail(spool: Spool) -> SpoolDetail:
+    return SpoolDetail.model_validate(spool, from_attributes=True)
 
 
 @app.get("/api/v1/spools/{spool_id}", response_model=SpoolDetail, tags=["spools"])
-def get_spool_with_history(spool_id: int, session: Session = Depends(get_session)) -> SpoolDetail:
-    spool = session.get(Spool, spool_id)
+async def get_spool_with_history(spool_id: int, session: AsyncSession = Depends(get_session)) -> SpoolDetail:
+    spool = await _get_spool_with_logs(spool_id, session)
     if not spool:
         raise HTTPException(status_code=404, detail="Spool not found")
-    return _build_spool_detail(spool, session)
+    return _build_spool_detail(spool)
 
 
 @app.put("/api/v1/spools/{spool_id}", response_model=SpoolDetail, tags=["spools"])
-def update_spool(
-    spool_id: int, spool_in: SpoolUpdate, session: Session = Depends(get_session)
+async def update_spool(
+    spool_id: int, spool_in: SpoolUpdate, session: AsyncSession = Depends(get_session)
 ) -> SpoolDetail:
-    spool = session.get(Spool, spool_id)
+    spool = await _get_spool_with_logs(spool_id, session)
     if not spool:
         raise HTTPException(status_code=404, detail="Spool not found")
 
@@ -313,16 +566,14 @@ def update_spool(
     update_data = spool_in.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(spool, key, value)
-    spool.updated_at = datetime.now(timezone.utc)
 
     session.add(spool)
-    session.commit()
-    session.refresh(spool)
 
     status_changed = "status" in update_data and previous_status != spool.status
     location_changed = "storage_location" in update_data and previous_location != spool.storage_location
 
-    if status_changed or location_changed:
+    logged = status_changed or location_changed
+    if logged:
         change_log = SpoolChangeLog(
             spool_id=spool.id,
             from_status=previous_status if status_changed else None,
@@ -331,18 +582,28 @@ def update_spool(
             to_location=spool.storage_location if location_changed else None,
         )
         session.add(change_log)
-        session.commit()
 
-    return _build_spool_detail(spool, session)
+    # Single commit: the mutation and its audit record land atomically,
+    # and SQLite/Postgres fsync once instead of twice
+    await session.commit()
+    _invalidate_cache("spools")
+    # updated_at is DB-generated on UPDATE; reload it (and the log
+    # collection when a new entry was written) for the response
+    await session.refresh(spool)
+    if logged:
+        await session.refresh(spool, attribute_names=["change_logs"])
+
+    return _build_spool_detail(spool)
 
 
 @app.delete("/api/v1/spools/{spool_id}", status_code=204, tags=["spools"])
-def delete_spool(spool_id: int, session: Session = Depends(get_session)) -> None:
-    spool = session.get(Spool, spool_id)
+async def delete_spool(spool_id: int, session: AsyncSession = Depends(get_session)) -> None:
+    spool = await session.get(Spool, spool_id)
     if not spool:
         raise HTTPException(status_code=404, detail="Spool not found")
-    session.delete(spool)
-    session.commit()
+    await session.delete(spool)
+    await session.commit()
+    _invalidate_cache("spools")
 
 
 # OCR Endpoint
@@ -362,8 +623,6 @@ async def parse_label(file: UploadFile = File(...)):
     Supported formats: JPEG, PNG, WebP
     Maximum file size: 10 MB
     """
-    from backend.validation import validate_image_file, ValidationError
-    
     try:
         # Read image bytes
         image_bytes = await file.read()
@@ -386,9 +645,10 @@ async def parse_label(file: UploadFile = File(...)):
             )
         
         # Parse label using OCR
-        from backend.ocr_service import OCRError
         try:
-            result = LabelParser.parse_label(image_bytes)
+            result = await _run_parse_cached(
+                "label", LabelParser.parse_label, image_bytes
+            )
             # Add validation metadata to response
             result["validation"] = {
                 "file_size_mb": round(metadata["file_size_bytes"] / (1024 * 1024), 2),
@@ -437,8 +697,6 @@ async def parse_invoice(file: UploadFile = File(...)):
     Maximum file size: 20 MB
     Maximum pages: 50
     """
-    from backend.validation import validate_pdf_file, ValidationError
-    
     try:
         # Read PDF bytes
         pdf_bytes = await file.read()
@@ -462,7 +720,12 @@ async def parse_invoice(file: UploadFile = File(...)):
         
         # Parse invoice
         try:
-            result = InvoiceParser.parse_invoice(pdf_bytes)
+            result = await _run_parse_cached(
+                "invoice", InvoiceParser.parse_invoice, pdf_bytes
+            )
+            # Items are slotted InvoiceItem instances; the JSON contract
+            # stays dict-shaped
+            result["items"] = [item.to_dict() for item in result["items"]]
             # Add validation metadata to response
             result["validation"] = {
                 "file_size_mb": round(metadata["file_size_bytes"] / (1024 * 1024), 2),
@@ -498,7 +761,7 @@ async def parse_invoice(file: UploadFile = File(...)):
 @app.post("/api/v1/invoice/import", tags=["invoice"])
 async def import_from_invoice(
     file: UploadFile = File(...),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Upload a PDF invoice and automatically create Products and Spools for all items.
@@ -518,8 +781,6 @@ async def import_from_invoice(
     Supported formats: PDF only
     Maximum file size: 20 MB
     """
-    from backend.validation import validate_pdf_file, ValidationError
-    
     try:
         # Read PDF bytes
         pdf_bytes = await file.read()
@@ -542,8 +803,10 @@ async def import_from_invoice(
             )
 
         try:
-            # Parse invoice
-            invoice_data = InvoiceParser.parse_invoice(pdf_bytes)
+            # Parse invoice; only the parse runs in the pool, DB work stays here
+            invoice_data = await _run_parse_cached(
+                "invoice", InvoiceParser.parse_invoice, pdf_bytes
+            )
         except ValueError as e:
             raise HTTPException(
                 status_code=400,
@@ -557,55 +820,68 @@ async def import_from_invoice(
         products_created = 0
         spools_created = 0
         imported_items = []
+        items = invoice_data["items"]
 
-        for item in invoice_data["items"]:
-            # Check if product exists
+        # Prefetch every candidate product in one statement instead of one
+        # SELECT per invoice item
+        item_key = lambda i: (i.brand, i.material, i.color_name, i.diameter_mm)  # noqa: E731
+        products_by_key = {}
+        if items:
             query = select(Product).where(
-                Product.brand == item["brand"],
-                Product.material == item["material"],
-                Product.color_name == item["color_name"],
-                Product.diameter_mm == item["diameter_mm"]
+                tuple_(
+                    Product.brand,
+                    Product.material,
+                    Product.color_name,
+                    Product.diameter_mm,
+                ).in_({item_key(item) for item in items})
             )
-            existing_product = session.exec(query).first()
-
-            if existing_product:
-                product = existing_product
-            else:
-                # Create new product
-                product = Product(
-                    brand=item["brand"],
-                    material=item["material"],
-                    color_name=item["color_name"],
-                    diameter_mm=item["diameter_mm"],
-                    line=item.get("product_line"),
-                    sku=item.get("sku")
+            for product in (await session.exec(query)).all():
+                key = (product.brand, product.material, product.color_name, product.diameter_mm)
+                products_by_key[key] = product
+
+        # Create any missing products, then flush once to assign their IDs
+        for item in items:
+            if item_key(item) not in products_by_key:
+                products_by_key[item_key(item)] = Product(
+                    brand=item.brand,
+                    material=item.material,
+                    color_name=item.color_name,
+                    diameter_mm=item.diameter_mm,
+                    line=item.product_line,
+                    sku=item.sku
                 )
-                session.add(product)
-                session.flush()  # Get product ID
+                session.add(products_by_key[item_key(item)])
                 products_created += 1
+        if products_created:
+            await session.flush()  # Get product IDs
+
+        # Collect all spools and insert them in one batch
+        new_spools = []
+        for item in items:
+            product = products_by_key[item_key(item)]
 
-            # Create spools for each quantity
-            for _ in range(item["quantity"]):
-                spool = Spool(
+            for _ in range(item.quantity):
+                new_spools.append(Spool(
                     product_id=product.id,
                     purchase_date=invoice_data["order_date"],
                     vendor=invoice_data["vendor"],
-                    price=item.get("price"),
+                    price=item.price,
                     status="in_stock"
-                )
-                session.add(spool)
-                spools_created += 1
+                ))
+            spools_created += item.quantity
 
             imported_items.append({
                 "product_id": product.id,
                 "brand": product.brand,
                 "material": product.material,
                 "color_name": product.color_name,
-                "quantity": item["quantity"],
-                "price": item.get("price")
+                "quantity": item.quantity,
+                "price": item.price
             })
 
-        session.commit()
+        session.add_all(new_spools)
+        await session.commit()
+        _invalidate_cache("products", "spools")
 
         return {
             "success": True,
@@ -643,7 +919,7 @@ class GoogleSheetsExportRequest(SQLModel):
 @app.post("/api/v1/export/google-sheets", tags=["export"])
 async def export_to_google_sheets(
     request: GoogleSheetsExportRequest,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Export inventory data to Google Sheets.
@@ -661,8 +937,6 @@ async def export_to_google_sheets(
     Environment Variables Required:
         GOOGLE_SHEETS_CREDENTIALS_PATH: Path to Google Service Account JSON file
     """
-    from backend.google_sheets import GoogleSheetsExporter, GoogleSheetsError
-    
     if not request.include_products and not request.include_spools:
         raise HTTPException(
             status_code=400,
@@ -678,65 +952,35 @@ async def export_to_google_sheets(
         
         # Fetch products if needed
         if request.include_products:
-            products = session.exec(select(Product)).all()
+            products = await session.stream(
+                select(Product).execution_options(yield_per=500)
+            )
             products_data = [
-                {
-                    "id": p.id,
-                    "brand": p.brand,
-                    "line": p.line,
-                    "material": p.material,
-                    "color_name": p.color_name,
-                    "diameter_mm": p.diameter_mm,
-                    "barcode": p.barcode,
-                    "sku": p.sku,
-                    "notes": p.notes,
-                    "created_at": p.created_at.isoformat() if p.created_at else None,
-                    "updated_at": p.updated_at.isoformat() if p.updated_at else None,
-                }
-                for p in products
+                p.model_dump(mode="json") async for p in products.scalars()
             ]
         
         # Fetch spools if needed
         if request.include_spools:
-            query = select(Spool)
+            query = (
+                select(Spool, Product)
+                .join(Product, isouter=True)
+                .options(noload(Spool.product), noload(Spool.change_logs))
+                .execution_options(yield_per=500)
+            )
             if request.spool_status:
                 query = query.where(Spool.status == request.spool_status)
-            spools = session.exec(query).all()
-            
-            # Get products for spools
-            product_ids = {s.product_id for s in spools}
+            rows = await session.stream(query)
+
+            spools_data = []
             products_lookup = {}
-            if product_ids:
-                product_query = select(Product).where(Product.id.in_(product_ids))
-                product_list = session.exec(product_query).all()
-                products_lookup = {p.id: p for p in product_list}
-            
-            spools_data = [
-                {
-                    "id": s.id,
-                    "product_id": s.product_id,
-                    "purchase_date": s.purchase_date.isoformat() if s.purchase_date else None,
-                    "vendor": s.vendor,
-                    "price": s.price,
-                    "storage_location": s.storage_location,
-                    "status": s.status.value,
-                    "created_at": s.created_at.isoformat() if s.created_at else None,
-                    "updated_at": s.updated_at.isoformat() if s.updated_at else None,
-                    "order_id": s.order_id
-                }
-                for s in spools
-            ]
-            
+            async for s, p in rows:
+                spools_data.append(s.model_dump(mode="json"))
+                if p is not None:
+                    products_lookup[p.id] = p
+
             # Convert to format expected by exporter (with product info)
             products_for_export = [
-                {
-                    "id": p.id,
-                    "brand": p.brand,
-                    "line": p.line,
-                    "material": p.material,
-                    "color_name": p.color_name,
-                    "diameter_mm": p.diameter_mm,
-                }
+                p.model_dump(mode="json", include=_PRODUCT_SUMMARY_FIELDS | {"id"})
                 for p in products_lookup.values()
             ] if products_lookup else None
         
@@ -772,7 +1016,6 @@ async def export_to_google_sheets(
 
 
 if __name__ == "__main__":
-    import os
     import uvicorn
 
     port = int(os.environ.get("PORT", 8000))
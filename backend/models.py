@@ -1,11 +1,12 @@
-from datetime import date, datetime, timezone
-from enum import Enum
+from datetime import date, datetime
+from enum import StrEnum
 from typing import List, Optional
 
+from sqlalchemy import func
 from sqlmodel import Column, DateTime, Field, Relationship, SQLModel
 
 
-class SpoolStatus(str, Enum):
+class SpoolStatus(StrEnum):
     IN_STOCK = "in_stock"
     USED_UP = "used_up"
     DONATED = "donated"
@@ -25,13 +26,13 @@ class ProductBase(SQLModel):
 
 class Product(ProductBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    created_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
-        sa_column=Column(DateTime(timezone=True)),
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now()),
     )
-    updated_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
-        sa_column=Column(DateTime(timezone=True), onupdate=lambda: datetime.now(timezone.utc)),
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now()),
     )
 
     spools: List["Spool"] = Relationship(back_populates="product")
@@ -65,19 +66,35 @@ class SpoolBase(SQLModel):
 class Spool(SpoolBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     order_id: Optional[int] = None
-    created_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
-        sa_column=Column(DateTime(timezone=True)),
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now()),
     )
-    updated_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
-        sa_column=Column(DateTime(timezone=True), onupdate=lambda: datetime.now(timezone.utc)),
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now()),
     )
 
-    product: Optional[Product] = Relationship(back_populates="spools")
+    # Eager by default: detail serialization walks both relationships, and
+    # lazy loading would mean one query per spool (and is illegal mid-await
+    # under the async session anyway). product joins in the same statement;
+    # change_logs batch-fetch with one WHERE spool_id IN (...) query. Bulk
+    # queries that don't touch them opt out with noload().
+    product: Optional[Product] = Relationship(
+        back_populates="spools",
+        sa_relationship_kwargs={"lazy": "joined"},
+    )
     change_logs: List["SpoolChangeLog"] = Relationship(
         back_populates="spool",
-        sa_relationship_kwargs={"order_by": "SpoolChangeLog.created_at.desc()"},
+        sa_relationship_kwargs={
+            "lazy": "selectin",
+            # Logs belong to their spool; delete them with it rather than
+            # nullifying a NOT NULL spool_id
+            "cascade": "all, delete-orphan",
+            # id tiebreaker: rows written in one transaction share a
+            # CURRENT_TIMESTAMP second on SQLite
+            "order_by": "[SpoolChangeLog.created_at.desc(), SpoolChangeLog.id.desc()]",
+        },
     )
 
 
@@ -107,9 +124,9 @@ class SpoolChangeLogBase(SQLModel):
 
 class SpoolChangeLog(SpoolChangeLogBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    created_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
-        sa_column=Column(DateTime(timezone=True)),
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now()),
     )
 
     spool: Optional[Spool] = Relationship(back_populates="change_logs")
@@ -1,12 +1,103 @@
+import hashlib
+import os
 import re
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Optional, Tuple
 import pytesseract
-from PIL import Image, ImageEnhance, ImageFilter, ImageOps
+from PIL import Image, ImageFilter, ImageOps, ImageStat
 from io import BytesIO
 
 logger = logging.getLogger(__name__)
 
+# Parsed-label cache keyed by content hash: a re-uploaded image (retry,
+# duplicate POST) costs one blake2b over the bytes instead of the full
+# multi-second Tesseract pass. LRU-bounded; guarded for threaded callers.
+_OCR_CACHE: "OrderedDict[bytes, Dict]" = OrderedDict()
+_OCR_CACHE_MAX = 256
+_ocr_cache_lock = threading.Lock()
+
+# Tesseract releases the GIL while it works, so batch uploads scale across
+# cores with plain threads; capped so a large batch can't starve the host
+_PARSE_POOL = ThreadPoolExecutor(max_workers=min(os.cpu_count() or 2, 4))
+
+# Pool for the strategy x PSM grid inside a single parse. Tesseract runs as
+# a subprocess and releases the GIL, so the passes scale across threads.
+# Separate from _PARSE_POOL: grid tasks must never queue behind the parse
+# tasks that spawned them.
+_OCR_POOL = ThreadPoolExecutor(max_workers=4)
+
+# Fallback patterns used by parse_label, compiled once at import.
+# Material alternation is ordered longest-first so compounds win.
+_MATERIAL_FALLBACK_RE = re.compile(
+    r'(PETG[\s\-]?HF|PLA\s?\+|PLA\s?PLUS|PETG|PLA|ABS|TPU)', re.IGNORECASE
+)
+_MATERIAL_CANONICAL = {
+    "PETGHF": "PETG HF",
+    "PLA+": "PLA+",
+    "PLAPLUS": "PLA+",
+    "PETG": "PETG",
+    "PLA": "PLA",
+    "ABS": "ABS",
+    "TPU": "TPU",
+}
+# Old elif-chain precedence (lower rank wins regardless of text position)
+_MATERIAL_RANK = {
+    "PETG HF": 0, "PLA+": 1, "PETG": 2, "PLA": 3, "ABS": 4, "TPU": 5,
+}
+_RE_FILAMENT_CODE = re.compile(r'(?:Filament Code|Code)[\s:]*(\d+)', re.IGNORECASE)
+_RE_SPOOL_COLOR = re.compile(r'(?:With\s+Spool|Spool)[\s:]+([A-Z][a-z]+)', re.IGNORECASE)
+_RE_FALLBACK_DIAMETER = re.compile(r'(1\.75|2\.85|3\.0)[\s]*(?:mm|毫米)', re.IGNORECASE)
+_RE_MISREAD_DIAMETER_175 = re.compile(r'[{\[]?\s*75\s*mm|175\s*mm|1\s*\.\s*75\s*mm', re.IGNORECASE)
+_RE_MISREAD_DIAMETER_285 = re.compile(r'[{\[]?\s*85\s*mm|285\s*mm|2\s*\.\s*85\s*mm', re.IGNORECASE)
+_RE_DIAMETER_SECTION = re.compile(r'\(Diameter\)\s*([0-9.]+)', re.IGNORECASE)
+_RE_FALLBACK_BARCODE = re.compile(r'X[0O][0O][0-9A-Z]{2}[0-9A-Z]{2}[0-9A-Z]{4}', re.IGNORECASE)
+
+_COMMON_COLORS = ("White", "Black", "Red", "Blue", "Green", "Yellow",
+                  "Orange", "Purple", "Grey", "Gray", "Silver", "Gold",
+                  "Pink", "Brown", "Natural", "Transparent", "Cyan", "Magenta", "Olive")
+# Brand tokens as one alternation: a single finditer pass replaces the
+# lowercase/no-space copies and the per-brand substring scans. Separator
+# classes absorb the OCR artifacts the old string surgery normalized away
+# ("bam bu", "e-sun", "sun lu", "ty jayo").
+_BRAND_TOKEN_RE = re.compile(
+    r'(?P<bambu>bam[\s\-_]*bu)'
+    r'|(?P<esun>e[\s\-_.]*sun)'
+    r'|(?P<jayo>jayo)'
+    r'|(?P<sunlu>sun[\s\-_]*lu)',
+    re.IGNORECASE,
+)
+# Same precedence the old elif chain had
+_BRAND_PRIORITY = ("bambu", "esun", "jayo", "sunlu")
+
+# One alternation scan instead of one full-text pass per color name
+_COLOR_UNION = re.compile(
+    r'\b(' + '|'.join(map(re.escape, _COMMON_COLORS)) + r')\b', re.IGNORECASE
+)
+
+# OCR misreadings mapped to correct color names
+_COLOR_CORRECTIONS = {
+    "yelow": "Yellow",
+    "yellw": "Yellow",
+    "yello": "Yellow",
+    "olve": "Olive",
+    "oliv": "Olive",
+    "gren": "Green",
+    "grene": "Green",
+    "blak": "Black",
+    "whit": "White",
+    "whte": "White"
+}
+
+# Candidates the brand-specific color pattern should reject: short codes
+# like "A1"/"HIF", and brand or material names masquerading as colors.
+_INVALID_COLOR_RES = (
+    re.compile(r'^[A-Z0-9]{1,3}$'),
+    re.compile(r'(?i)^(esun|sunlu|bambu|pla|petg|abs|tpu|filament)'),
+)
+
 
 class OCRError(Exception):
     """Custom exception for OCR-related errors."""
@@ -37,43 +128,67 @@ class LabelParser:
         "洋红色": "Magenta",
     }
 
+    # Single alternation scan over the Chinese color names; longest-first so
+    # 洋红色 (Magenta) wins over its 红色 (Red) suffix
+    CHINESE_COLOR_RE = re.compile(
+        "|".join(sorted(map(re.escape, CHINESE_COLOR_MAP), key=len, reverse=True))
+    )
+
+    # Patterns are compiled once at class definition: per-call re.search with
+    # raw strings pays an re-cache lookup and flag application on every parse.
+    # material/color matched case-insensitively; diameter/barcode as-is.
     BRAND_PATTERNS = {
         "esun": {
-            "identifier": r"e(SUN|sun)",
-            "material": r"(PLA\+|PLA|ABS|PETG|TPU)",
-            "color": r"(?:Printers,?\s+|,\s+)?(White|Black|Red|Blue|Green|Yellow|Orange|Purple|Grey|Gray|Transparent|Natural|Silver|Gold|Pink|Brown|Cyan|Magenta|[A-Z][a-z]+)",
-            "diameter": r"(1\.75|2\.85|3\.0)[\s]?mm",
-            "barcode": r"X0[A-Z0-9IO]{2}[A-Z0-9IO]{2}[A-Z0-9IO]{4}"
+            "identifier": re.compile(r"e(SUN|sun)"),
+            "material": re.compile(r"(PLA\+|PLA|ABS|PETG|TPU)", re.IGNORECASE),
+            "color": re.compile(r"(?:Printers,?\s+|,\s+)?(White|Black|Red|Blue|Green|Yellow|Orange|Purple|Grey|Gray|Transparent|Natural|Silver|Gold|Pink|Brown|Cyan|Magenta|[A-Z][a-z]+)", re.IGNORECASE),
+            "diameter": re.compile(r"(1\.75|2\.85|3\.0)[\s]?mm"),
+            "barcode": re.compile(r"X0[A-Z0-9IO]{2}[A-Z0-9IO]{2}[A-Z0-9IO]{4}")
         },
         "sunlu": {
-            "identifier": r"SUNLU",
-            "material": r"(SILK[\s]+PLA|PLA\+|PLA|ABS|PETG|TPU)",
-            "color": r"(White|Black|Red|Blue|Green|Yellow|Orange|Purple|Grey|Gray|Silver|Gold|Pink|Brown|Cyan|Magenta|[A-Z][a-z]+)",
-            "diameter": r"(1\.75|2\.85|3\.0)[\s]?mm",
-            "barcode": r"X[0-9]{4}[A-Z0-9]{6}"
+            "identifier": re.compile(r"SUNLU"),
+            "material": re.compile(r"(SILK[\s]+PLA|PLA\+|PLA|ABS|PETG|TPU)", re.IGNORECASE),
+            "color": re.compile(r"(White|Black|Red|Blue|Green|Yellow|Orange|Purple|Grey|Gray|Silver|Gold|Pink|Brown|Cyan|Magenta|[A-Z][a-z]+)", re.IGNORECASE),
+            "diameter": re.compile(r"(1\.75|2\.85|3\.0)[\s]?mm"),
+            "barcode": re.compile(r"X[0-9]{4}[A-Z0-9]{6}")
         },
         "bambu": {
-            "identifier": r"Bambu[\s]*Lab",
-            "material": r"(PETG[\s-]?HF|PETG|PLA[\s-]?Basic|PLA[\s-]?Matte|PLA[\s-]?Silk|PLA|ABS|TPU|ASA)",
-            "color": r"(Black|White|Red|Blue|Green|Yellow|Orange|Purple|Grey|Gray|Natural|Transparent|Silver|Gold|Pink|Brown|Cyan|Magenta|[A-Z][a-z]+)",
-            "diameter": r"(1\.75|2\.85|3\.0)[\s]?mm|(1\.75|2\.85|3\.0)[\s]?毫米",  # Support both mm and Chinese 毫米
+            "identifier": re.compile(r"Bambu[\s]*Lab"),
+            "material": re.compile(r"(PETG[\s-]?HF|PETG|PLA[\s-]?Basic|PLA[\s-]?Matte|PLA[\s-]?Silk|PLA|ABS|TPU|ASA)", re.IGNORECASE),
+            "color": re.compile(r"(Black|White|Red|Blue|Green|Yellow|Orange|Purple|Grey|Gray|Natural|Transparent|Silver|Gold|Pink|Brown|Cyan|Magenta|[A-Z][a-z]+)", re.IGNORECASE),
+            # Support both mm and Chinese 毫米
+            "diameter": re.compile(r"(1\.75|2\.85|3\.0)[\s]?mm|(1\.75|2\.85|3\.0)[\s]?毫米"),
             "barcode": None  # Bambu uses QR codes
         },
         "jayo": {
-            "identifier": r"JAYO",
-            "material": r"(PETG|PLA\+|PLA|ABS|TPU)",
-            "color": r"(Black|White|Red|Blue|Green|Yellow|Orange|Purple|Grey|Gray|Natural|Transparent|Silver|Gold|Pink|Brown|Cyan|Magenta|Olive|Olve|[A-Z][a-z]+)",
-            "diameter": r"(1\.75|2\.85|3\.0)[\s]?mm|(1\.75|2\.85|3\.0)[\s]?毫米",
+            "identifier": re.compile(r"JAYO"),
+            "material": re.compile(r"(PETG|PLA\+|PLA|ABS|TPU)", re.IGNORECASE),
+            "color": re.compile(r"(Black|White|Red|Blue|Green|Yellow|Orange|Purple|Grey|Gray|Natural|Transparent|Silver|Gold|Pink|Brown|Cyan|Magenta|Olive|Olve|[A-Z][a-z]+)", re.IGNORECASE),
+            "diameter": re.compile(r"(1\.75|2\.85|3\.0)[\s]?mm|(1\.75|2\.85|3\.0)[\s]?毫米"),
             "barcode": None
         }
     }
 
+    # Canonical display names for detected brand keys
+    BRAND_DISPLAY_NAMES = {
+        "esun": "eSUN",
+        "sunlu": "Sunlu",
+        "bambu": "Bambu Lab",
+        "jayo": "JAYO"
+    }
+
     # PSM modes optimized for labels (try in order of preference)
     PSM_MODES = [
         6,   # Uniform block of text (best for labels)
         11,  # Sparse text (good for labels with spacing)
-        3,   # Fully automatic (fallback)
-        7,   # Single text line (fallback)
+    ]
+
+    # Only swept when the primary modes read poorly (confidence < 40):
+    # fully-automatic and single-line segmentation rarely beat 6/11 on box
+    # labels, so by default they just double the invocation count
+    FALLBACK_PSM_MODES = [
+        3,   # Fully automatic
+        7,   # Single text line
     ]
 
     @staticmethod
@@ -91,10 +206,10 @@ class LabelParser:
         """Validate and load image, raising descriptive errors."""
         try:
             img = Image.open(BytesIO(image_bytes))
-            # Verify image is readable
-            img.verify()
-            # Reopen after verify (verify closes the image)
-            img = Image.open(BytesIO(image_bytes))
+            # Force the full decode now: verify() only skims the file and
+            # invalidates the object (requiring a second open), while load()
+            # surfaces truncation/corruption in the one decode we keep anyway
+            img.load()
             return img
         except Exception as e:
             raise OCRError(f"Invalid image format or corrupted image: {str(e)}")
@@ -108,21 +223,32 @@ class LabelParser:
         except Exception:
             pass  # If EXIF data missing or error, continue
 
-        # Convert to RGB if needed
-        if img.mode != "RGB":
-            img = img.convert("RGB")
+        # Convert to single-channel grayscale: Tesseract converts internally
+        # anyway, and every later resize/filter pass then touches a third of
+        # the bytes an RGB buffer would
+        if img.mode != "L":
+            img = img.convert("L")
+
+        # Crop to the edge-dense region (the label) before resizing: on a
+        # phone photo the label covers a fraction of the frame, and resizing
+        # the rest is wasted LANCZOS work
+        img = LabelParser._crop_to_content(img)
 
         # Resize to optimal size for OCR
         width, height = img.size
         max_dimension = 2000
         min_dimension = 800
 
-        # Downscale if too large
+        # Downscale if too large. BOX is area averaging — the right
+        # anti-aliasing filter for shrinking (cv2 calls it INTER_AREA) and a
+        # plain running sum instead of LANCZOS's wide windowed-sinc kernel,
+        # so multi-megapixel phone photos shrink in a fraction of the time
+        # with no ringing around label text.
         if width > max_dimension or height > max_dimension:
             scale_factor = max_dimension / max(width, height)
             new_width = int(width * scale_factor)
             new_height = int(height * scale_factor)
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            img = img.resize((new_width, new_height), Image.Resampling.BOX)
 
         # Upscale if too small
         elif width < min_dimension or height < min_dimension:
@@ -133,55 +259,170 @@ class LabelParser:
 
         return img
 
+    @staticmethod
+    def _sharpen_enhance(img: Image.Image, contrast: float, brightness: float = 1.0) -> Image.Image:
+        """Sharpen, contrast and brightness fused into one convolution pass.
+
+        The enhancement LUT is affine (y = a*x + b with a = brightness *
+        contrast, b = brightness * mean * (1 - contrast)), so it folds into
+        the sharpen kernel's scale and offset: one filter() traversal
+        replaces the sharpen pass plus the LUT pass, halving the full-image
+        reads/writes per strategy. The mean pivot comes from the pre-sharpen
+        image; the kernel's weights sum to one, so the mean is preserved.
+        """
+        mean = ImageStat.Stat(img).mean[0]
+        a = brightness * contrast
+        b = brightness * mean * (1 - contrast)
+        # ImageFilter.SHARPEN's kernel, with the affine map folded into
+        # scale (divisor) and offset
+        kernel = ImageFilter.Kernel(
+            (3, 3),
+            (-2, -2, -2, -2, 32, -2, -2, -2, -2),
+            scale=16 / a,
+            offset=b,
+        )
+        return img.filter(kernel)
+
+    @staticmethod
+    def _crop_to_content(img: Image.Image) -> Image.Image:
+        """Crop a grayscale image to its edge-bearing bounding box.
+
+        Edge detection runs on a ~256px thumbnail (cheap regardless of the
+        input size); the detected box is mapped back to full coordinates
+        with a small margin. Falls back to the full image when the box is
+        tiny (probably noise, no text found) or nearly the whole frame
+        (cropping wouldn't save anything).
+        """
+        width, height = img.size
+        probe = img.copy()
+        probe.thumbnail((256, 256))
+
+        edges = probe.filter(ImageFilter.FIND_EDGES)
+        # Suppress sensor noise; keep only strong edges
+        mask = edges.point([0] * 41 + [255] * 215)
+        # FIND_EDGES leaves convolution artifacts on the outermost pixels;
+        # inset the mask so they can't inflate the box to the full frame
+        inset = 2
+        if mask.width <= 2 * inset or mask.height <= 2 * inset:
+            return img
+        bbox = mask.crop(
+            (inset, inset, mask.width - inset, mask.height - inset)
+        ).getbbox()
+        if not bbox:
+            return img
+        bbox = tuple(coord + inset for coord in bbox)
+
+        scale_x = width / probe.width
+        scale_y = height / probe.height
+        margin_x = int(width * 0.05)
+        margin_y = int(height * 0.05)
+        left = max(0, int(bbox[0] * scale_x) - margin_x)
+        top = max(0, int(bbox[1] * scale_y) - margin_y)
+        right = min(width, int(bbox[2] * scale_x) + margin_x)
+        bottom = min(height, int(bbox[3] * scale_y) + margin_y)
+
+        area_fraction = ((right - left) * (bottom - top)) / (width * height)
+        if area_fraction < 0.10 or area_fraction > 0.90:
+            return img
+        return img.crop((left, top, right, bottom))
+
+    @staticmethod
+    def _otsu_threshold(img: Image.Image) -> int:
+        """Pick a binarization threshold by Otsu's method.
+
+        Works on the 256-bin histogram (maximizing between-class variance),
+        so the cost is independent of image size. Adapts to each label's
+        lighting instead of assuming midpoint gray.
+        """
+        hist = img.histogram()
+        total = sum(hist)
+        if total == 0:
+            return 128
+
+        sum_all = sum(i * count for i, count in enumerate(hist))
+        sum_bg = 0
+        weight_bg = 0
+        best_threshold = 128
+        best_variance = 0.0
+
+        for i, count in enumerate(hist):
+            weight_bg += count
+            if weight_bg == 0:
+                continue
+            weight_fg = total - weight_bg
+            if weight_fg == 0:
+                break
+            sum_bg += i * count
+            mean_bg = sum_bg / weight_bg
+            mean_fg = (sum_all - sum_bg) / weight_fg
+            variance = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+            if variance > best_variance:
+                best_variance = variance
+                best_threshold = i
+
+        return best_threshold
+
     @staticmethod
     def _preprocess_strategy_1(img: Image.Image) -> Image.Image:
-        """Strategy 1: Moderate enhancement (good for clear labels)."""
-        img = LabelParser._preprocess_basic(img)
-        # Light sharpening
-        img = img.filter(ImageFilter.SHARPEN)
-        # Moderate contrast enhancement
-        enhancer = ImageEnhance.Contrast(img)
-        img = enhancer.enhance(1.5)
-        return img
+        """Strategy 1: Moderate enhancement (good for clear labels).
+
+        Expects a _preprocess_basic'd grayscale image.
+        """
+        # Light sharpening + moderate contrast, fused into one pass
+        return LabelParser._sharpen_enhance(img, 1.5)
 
     @staticmethod
     def _preprocess_strategy_2(img: Image.Image) -> Image.Image:
-        """Strategy 2: Grayscale + binarization (good for high contrast labels)."""
-        img = LabelParser._preprocess_basic(img)
-        # Convert to grayscale
-        img = img.convert("L")
-        # Enhance contrast
-        enhancer = ImageEnhance.Contrast(img)
-        img = enhancer.enhance(2.0)
-        # Binarize (convert to pure black/white)
-        threshold = 128
-        img = img.point(lambda x: 255 if x > threshold else 0, mode='1')
-        # Convert back to RGB for Tesseract
-        img = img.convert("RGB")
+        """Strategy 2: Binarization (good for high contrast labels).
+
+        Expects a _preprocess_basic'd grayscale image.
+        """
+        # Binarize (convert to pure black/white) at an Otsu-chosen threshold;
+        # handing Tesseract a bilevel image makes its own thresholding a no-op.
+        # No contrast pre-pass: Otsu adapts to the image's own histogram, so
+        # a contrast LUT beforehand mostly just moves where the split lands.
+        threshold = LabelParser._otsu_threshold(img)
+        img = img.point([0] * (threshold + 1) + [255] * (255 - threshold), mode='1')
         return img
 
     @staticmethod
     def _preprocess_strategy_3(img: Image.Image) -> Image.Image:
-        """Strategy 3: Aggressive enhancement (for poor quality images)."""
-        img = LabelParser._preprocess_basic(img)
-        # Sharpening
-        img = img.filter(ImageFilter.SHARPEN)
-        # High contrast
-        enhancer = ImageEnhance.Contrast(img)
-        img = enhancer.enhance(2.5)
-        # Brightness adjustment
-        brightness_enhancer = ImageEnhance.Brightness(img)
-        img = brightness_enhancer.enhance(1.3)
-        return img
+        """Strategy 3: Aggressive enhancement (for poor quality images).
+
+        Expects a _preprocess_basic'd grayscale image.
+        """
+        # Sharpening + high contrast + brightness, fused into one pass
+        return LabelParser._sharpen_enhance(img, 2.5, brightness=1.3)
 
     @staticmethod
     def _preprocess_strategy_4(img: Image.Image) -> Image.Image:
-        """Strategy 4: Minimal processing (for already good images)."""
-        img = LabelParser._preprocess_basic(img)
+        """Strategy 4: Minimal processing (for already good images).
+
+        Expects a _preprocess_basic'd grayscale image.
+        """
         # Just light sharpening
         img = img.filter(ImageFilter.SHARPEN)
         return img
 
+    @staticmethod
+    def _is_blank(img: Image.Image) -> bool:
+        """Detect blank/black/white frames without running OCR.
+
+        Foreground density comes from a thumbnail histogram split at the
+        Otsu threshold — well under a millisecond, vs seconds of Tesseract
+        on an image that cannot contain text.
+        """
+        probe = img if img.mode == "L" else img.convert("L")
+        probe = probe.copy()
+        probe.thumbnail((256, 256))
+        hist = probe.histogram()
+        total = sum(hist)
+        if total == 0:
+            return True
+        threshold = LabelParser._otsu_threshold(probe)
+        dark_fraction = sum(hist[:threshold + 1]) / total
+        return dark_fraction < 0.01 or dark_fraction > 0.99
+
     @staticmethod
     def _run_ocr_with_config(img: Image.Image, psm: int, lang: str = 'eng+chi_sim') -> Tuple[str, float]:
         """
@@ -199,20 +440,7 @@ class LabelParser:
         try:
             # Get detailed data including confidence
             data = pytesseract.image_to_data(img, config=config, output_type=pytesseract.Output.DICT)
-            
-            # Extract text and calculate average confidence
-            text_parts = []
-            confidences = []
-            
-            for i, conf in enumerate(data['conf']):
-                if int(conf) > 0:  # Valid confidence
-                    text_parts.append(data['text'][i])
-                    confidences.append(float(conf))
-            
-            text = ' '.join(text_parts).strip()
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-            
-            return text, avg_confidence
+            return LabelParser._aggregate_ocr_data(data)
         except Exception as e:
             error_msg = str(e).lower()
             # If Chinese language not available, fallback to English only
@@ -221,15 +449,7 @@ class LabelParser:
                 config_eng = f'--oem 3 --psm {psm} -l eng'
                 try:
                     data = pytesseract.image_to_data(img, config=config_eng, output_type=pytesseract.Output.DICT)
-                    text_parts = []
-                    confidences = []
-                    for i, conf in enumerate(data['conf']):
-                        if int(conf) > 0:
-                            text_parts.append(data['text'][i])
-                            confidences.append(float(conf))
-                    text = ' '.join(text_parts).strip()
-                    avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-                    return text, avg_confidence
+                    return LabelParser._aggregate_ocr_data(data)
                 except Exception as e2:
                     logger.warning(f"OCR failed with English fallback PSM {psm}: {e2}")
                     text = pytesseract.image_to_string(img, config=config_eng)
@@ -247,65 +467,207 @@ class LabelParser:
                     text = pytesseract.image_to_string(img, config=config_eng)
                     return text, 0.0
 
+    @staticmethod
+    def _aggregate_ocr_data(data: Dict) -> Tuple[str, float]:
+        """Collapse image_to_data output into (text, mean word confidence).
+
+        One zip pass over the conf/text columns with a running sum — no
+        index lookups into the other columns Tesseract materializes, and no
+        intermediate confidence list just to average it.
+        """
+        text_parts = []
+        conf_sum = 0.0
+        conf_count = 0
+        for word, conf in zip(data['text'], data['conf']):
+            if float(conf) > 0:  # Valid confidence
+                text_parts.append(word)
+                conf_sum += float(conf)
+                conf_count += 1
+        text = ' '.join(text_parts).strip()
+        return text, (conf_sum / conf_count if conf_count else 0.0)
+
+    @staticmethod
+    def _fields_resolved(text: str) -> bool:
+        """Quick probe: does this text already carry every field we extract?
+
+        Cheap regex checks only — the full brand-specific parse still runs
+        later on the winning text. Used to stop the OCR grid as soon as one
+        pass has produced a complete label.
+        """
+        if not LabelParser.detect_brand(text):
+            return False
+        if not _MATERIAL_FALLBACK_RE.search(text):
+            return False
+        if not _RE_FALLBACK_DIAMETER.search(text):
+            return False
+        return _COLOR_UNION.search(text) is not None
+
+    # Last (strategy, psm) combination that produced a winning OCR pass.
+    # Labels arriving in a batch tend to be photographed alike, so trying
+    # the previous winner first usually ends the grid after one invocation.
+    _last_winning_combo: Optional[Tuple[str, int]] = None
+
     @staticmethod
     def _extract_text_multiple_strategies(image_bytes: bytes) -> Tuple[str, str]:
         """
         Try multiple preprocessing strategies and PSM modes to get best OCR result.
-        
+
+        Each Tesseract invocation dominates wall time, so the grid stops as
+        soon as a pass both reads confidently (>=60) and already contains
+        brand, material, color and diameter — clean labels finish after one
+        or two invocations instead of the full strategy x PSM sweep. Hard
+        labels fan the sweep out across a thread pool (Tesseract runs as a
+        subprocess, so passes overlap) and cancel unstarted passes once a
+        winner arrives.
+
         Returns:
             Tuple of (best_text, strategy_used)
         """
         original_img = LabelParser._validate_image(image_bytes)
-        
-        strategies = [
-            ("strategy_1_moderate", LabelParser._preprocess_strategy_1),
-            ("strategy_4_minimal", LabelParser._preprocess_strategy_4),
-            ("strategy_2_grayscale", LabelParser._preprocess_strategy_2),
-            ("strategy_3_aggressive", LabelParser._preprocess_strategy_3),
+
+        # Blank/black/white frames can't contain text; skip the OCR grid
+        if LabelParser._is_blank(original_img):
+            logger.info("Image appears blank; skipping OCR")
+            return "", "blank_skip"
+
+        # Orientation, grayscale, crop and resize are identical for every
+        # strategy, so run them once here; each strategy then applies only
+        # its own enhancement on top (filter/point return new images, so no
+        # per-strategy copy is needed either).
+        base_img = LabelParser._preprocess_basic(original_img)
+
+        strategy_funcs = {
+            "strategy_1_moderate": LabelParser._preprocess_strategy_1,
+            "strategy_4_minimal": LabelParser._preprocess_strategy_4,
+            "strategy_2_grayscale": LabelParser._preprocess_strategy_2,
+            "strategy_3_aggressive": LabelParser._preprocess_strategy_3,
+        }
+        combos = [
+            (strategy_name, psm)
+            for strategy_name in strategy_funcs
+            for psm in LabelParser.PSM_MODES
         ]
-        
+        fallback_combos = [
+            (strategy_name, psm)
+            for strategy_name in strategy_funcs
+            for psm in LabelParser.FALLBACK_PSM_MODES
+        ]
+        # Try the previous winner first (cheap MRU specialization)
+        mru = LabelParser._last_winning_combo
+        if mru in combos:
+            combos.remove(mru)
+            combos.insert(0, mru)
+        elif mru in fallback_combos:
+            fallback_combos.remove(mru)
+            combos.insert(0, mru)
+
+        preprocessed: Dict[str, Optional[Image.Image]] = {}
+        for strategy_name, strategy_func in strategy_funcs.items():
+            try:
+                preprocessed[strategy_name] = strategy_func(base_img)
+            except Exception as e:
+                logger.warning(f"Strategy {strategy_name} failed: {e}")
+                preprocessed[strategy_name] = None
+
         best_text = ""
         best_confidence = 0.0
         best_strategy = "unknown"
         best_psm = 6
-        
-        for strategy_name, strategy_func in strategies:
+
+        def _is_early_exit(text: str, confidence: float) -> bool:
+            # Very high raw confidence, or a confident pass that already
+            # resolved every field
+            return confidence > 80 or (
+                confidence >= 60 and LabelParser._fields_resolved(text)
+            )
+
+        def _is_improvement(text: str, confidence: float) -> bool:
+            # Check we got meaningful text, then prefer higher confidence
+            # or longer text
+            if not text or len(text.strip()) <= 10:
+                return False
+            return confidence > best_confidence or (
+                confidence > 0 and len(text) > len(best_text)
+            )
+
+        # Probe the MRU combination synchronously first: on a clean label it
+        # ends the grid after this single Tesseract invocation, without the
+        # speculative passes the concurrent sweep below would start.
+        probe_name, probe_psm = combos[0]
+        probe_img = preprocessed[probe_name]
+        if probe_img is not None:
             try:
-                preprocessed_img = strategy_func(original_img.copy())
-                
-                # Try different PSM modes
-                for psm in LabelParser.PSM_MODES:
+                text, confidence = LabelParser._run_ocr_with_config(probe_img, probe_psm)
+                if _is_improvement(text, confidence):
+                    best_text = text
+                    best_confidence = confidence
+                    best_strategy = probe_name
+                    best_psm = probe_psm
+                    if _is_early_exit(text, confidence):
+                        logger.info(f"Early OCR exit: {confidence:.1f}% using {probe_name} PSM{probe_psm}")
+                        LabelParser._last_winning_combo = (probe_name, probe_psm)
+                        return best_text, f"{probe_name}_psm{probe_psm}"
+            except Exception as e:
+                logger.debug(f"PSM {probe_psm} failed for {probe_name}: {e}")
+
+        def _sweep(sweep_combos: "list[Tuple[str, int]]") -> bool:
+            """Fan combinations out across the OCR pool; True on early exit.
+
+            Tesseract work overlaps across threads, and the first result
+            that clears the early-exit bar cancels whatever hasn't started.
+            """
+            nonlocal best_text, best_confidence, best_strategy, best_psm
+            futures = {}
+            for strategy_name, psm in sweep_combos:
+                preprocessed_img = preprocessed[strategy_name]
+                if preprocessed_img is None:
+                    continue
+                future = _OCR_POOL.submit(
+                    LabelParser._run_ocr_with_config, preprocessed_img, psm
+                )
+                futures[future] = (strategy_name, psm)
+
+            try:
+                for future in as_completed(futures):
+                    strategy_name, psm = futures[future]
                     try:
-                        text, confidence = LabelParser._run_ocr_with_config(preprocessed_img, psm)
-                        
-                        # Check if we got meaningful text
-                        if text and len(text.strip()) > 10:  # At least some text
-                            # Prefer higher confidence or longer text
-                            if confidence > best_confidence or (confidence > 0 and len(text) > len(best_text)):
-                                best_text = text
-                                best_confidence = confidence
-                                best_strategy = strategy_name
-                                best_psm = psm
-                                
-                                # If confidence is very high, we can stop early
-                                if confidence > 80:
-                                    logger.info(f"High confidence OCR result: {confidence:.1f}% using {strategy_name} PSM{psm}")
-                                    return best_text, f"{strategy_name}_psm{psm}"
+                        text, confidence = future.result()
                     except Exception as e:
                         logger.debug(f"PSM {psm} failed for {strategy_name}: {e}")
                         continue
-                        
-            except Exception as e:
-                logger.warning(f"Strategy {strategy_name} failed: {e}")
-                continue
-        
+
+                    if _is_improvement(text, confidence):
+                        best_text = text
+                        best_confidence = confidence
+                        best_strategy = strategy_name
+                        best_psm = psm
+
+                        if _is_early_exit(text, confidence):
+                            logger.info(f"Early OCR exit: {confidence:.1f}% using {strategy_name} PSM{psm}")
+                            return True
+            finally:
+                for future in futures:
+                    future.cancel()
+            return False
+
+        # Hard label: sweep the primary PSM modes, and widen to the fallback
+        # modes only when the primaries read poorly
+        early = _sweep(combos[1:])
+        if not early and best_confidence < 40:
+            early = _sweep(fallback_combos)
+        if early:
+            LabelParser._last_winning_combo = (best_strategy, best_psm)
+            return best_text, f"{best_strategy}_psm{best_psm}"
+
         if best_text:
             logger.info(f"Best OCR result: confidence {best_confidence:.1f}% using {best_strategy} PSM{best_psm}")
+            LabelParser._last_winning_combo = (best_strategy, best_psm)
             return best_text, f"{best_strategy}_psm{best_psm}"
         else:
-            # Last resort: try original image with default settings (English + Chinese, fallback to English)
+            # Last resort: try the shared base image with default settings
+            # (English + Chinese, fallback to English)
             try:
-                img = LabelParser._preprocess_basic(original_img)
+                img = base_img
                 try:
                     text = pytesseract.image_to_string(img, config='--oem 3 --psm 3 -l eng+chi_sim')
                     return text, "fallback"
@@ -318,50 +680,28 @@ class LabelParser:
 
     @staticmethod
     def detect_brand(text: str) -> Optional[str]:
-        """Detect brand from OCR text."""
+        """Detect brand from OCR text with one pass over the raw text."""
         if not text:
             return None
-            
+
+        found = {m.lastgroup for m in _BRAND_TOKEN_RE.finditer(text)}
+        for brand in _BRAND_PRIORITY:
+            if brand in found:
+                return brand
+
+        # No direct brand token: fall back to the Bambu Lab OCR-misread
+        # heuristics ("Bambu" often comes out as "Hifé"; temperature range
+        # 230-260°C plus diameter/origin text indicates a Bambu label).
+        # Only this slow path pays for the lowercase copy.
         text_lower = text.lower()
-        # Remove spaces and special characters for better matching
-        text_no_space = text_lower.replace(" ", "").replace("\n", "").replace("-", "").replace("_", "")
-
-        # Bambu Lab - check first (before eSUN) since "Lab" might be misread
-        # Also check for common OCR mistakes: "Bambu" might be read as "Hifé", "Bam bu", "Bambulab", etc.
-        # Look for patterns that indicate Bambu Lab labels:
-        # - "Hifé" is often OCR misreading "Bambu"
-        # - Temperature range 230-260°C is common for Bambu Lab
-        # - "Made in China" with filament specs
-        # - Diameter specs with specific format
-        bambu_indicators = [
-            "bambu" in text_no_space,
-            "bambulab" in text_no_space,
-            "bambu lab" in text_lower,
-            "bam bu" in text_lower,
-            # OCR misreading "Bambu" as "Hifé"
-            ("hifé" in text_lower or "hife" in text_lower) and 
-            ("230" in text_lower or "260" in text_lower) and
-            ("made in china" in text_lower or "made in" in text_lower),
-            # Pattern matching: temperature range + diameter + made in china
-            ("230" in text_lower and "260" in text_lower and 
-             ("1.75" in text_lower or "1,75" in text_lower or "diameter" in text_lower) and
-             ("made in china" in text_lower or "filament" in text_lower))
-        ]
-        
-        if any(bambu_indicators):
+        if (("hifé" in text_lower or "hife" in text_lower)
+                and ("230" in text_lower or "260" in text_lower)
+                and "made in" in text_lower):
+            return "bambu"
+        if ("230" in text_lower and "260" in text_lower
+                and ("1.75" in text_lower or "1,75" in text_lower or "diameter" in text_lower)
+                and ("made in china" in text_lower or "filament" in text_lower)):
             return "bambu"
-        # eSUN variations
-        elif ("esun" in text_no_space or "e-sun" in text_lower or 
-              "e sun" in text_lower or "e.sun" in text_lower):
-            return "esun"
-        # JAYO - check for JAYO brand (often misread as "Ty JAYO" or "JAYOPETG")
-        elif ("jayo" in text_no_space or "jayo" in text_lower or
-              "jayopetg" in text_no_space or "ty jayo" in text_lower):
-            return "jayo"
-        # Sunlu
-        elif ("sunlu" in text_no_space or "sun lu" in text_lower or
-              "sunluplasd" in text_no_space):
-            return "sunlu"
         return None
 
     @staticmethod
@@ -369,11 +709,47 @@ class LabelParser:
         """
         Parse filament label image and extract structured data.
 
+        Identical bytes short-circuit to a cached result, so duplicate
+        uploads skip OCR entirely.
+
         Returns dict with keys: brand, material, color_name, diameter_mm, barcode, raw_text, ocr_confidence, strategy_used
         
         Raises:
             OCRError: If OCR fails or Tesseract is not available
         """
+        key = hashlib.blake2b(image_bytes, digest_size=16).digest()
+        with _ocr_cache_lock:
+            cached = _OCR_CACHE.get(key)
+            if cached is not None:
+                _OCR_CACHE.move_to_end(key)
+                return dict(cached)
+
+        result = LabelParser._parse_label_uncached(image_bytes)
+
+        # Don't cache failed parses: the grid isn't deterministic (MRU
+        # ordering shifts between calls), so a re-upload deserves a fresh
+        # attempt rather than a pinned error, and failures shouldn't evict
+        # useful entries.
+        if "error" not in result:
+            with _ocr_cache_lock:
+                _OCR_CACHE[key] = dict(result)
+                _OCR_CACHE.move_to_end(key)
+                while len(_OCR_CACHE) > _OCR_CACHE_MAX:
+                    _OCR_CACHE.popitem(last=False)
+        return result
+
+    @staticmethod
+    def parse_labels_batch(images: "list[bytes]") -> "list[Dict[str, Optional[str]]]":
+        """Parse several label images concurrently.
+
+        Fans parse_label out over a small thread pool; results come back in
+        input order. Cache hits stay cheap, misses overlap their Tesseract
+        work across cores.
+        """
+        return list(_PARSE_POOL.map(LabelParser.parse_label, images))
+
+    @staticmethod
+    def _parse_label_uncached(image_bytes: bytes) -> Dict[str, Optional[str]]:
         # Check Tesseract availability
         if not LabelParser._check_tesseract_available():
             raise OCRError(
@@ -385,7 +761,9 @@ class LabelParser:
             # Extract text using multiple strategies
             text, strategy_used = LabelParser._extract_text_multiple_strategies(image_bytes)
             
-            if not text or len(text.strip()) < 5:
+            # Shorter than any plausible label (brand + material alone exceed
+            # this): bail out before running the brand/field extraction
+            if not text or len(text.strip()) < 20:
                 return {
                     "brand": None,
                     "material": None,
@@ -416,14 +794,8 @@ class LabelParser:
             patterns = LabelParser.BRAND_PATTERNS[brand]
 
             # Extract fields using brand-specific patterns
-            brand_names = {
-                "esun": "eSUN",
-                "sunlu": "Sunlu",
-                "bambu": "Bambu Lab",
-                "jayo": "JAYO"
-            }
             result = {
-                "brand": brand_names.get(brand, brand.title()),
+                "brand": LabelParser.BRAND_DISPLAY_NAMES.get(brand, brand.title()),
                 "material": None,
                 "color_name": None,
                 "diameter_mm": None,
@@ -435,7 +807,7 @@ class LabelParser:
 
             # Material
             # First try standard pattern
-            material_match = re.search(patterns["material"], text, re.IGNORECASE)
+            material_match = patterns["material"].search(text)
             if material_match:
                 # Normalize material name (remove hyphens, standardize spacing)
                 material = material_match.group(1).upper()
@@ -443,13 +815,10 @@ class LabelParser:
                 material = " ".join(material.split())  # Normalize whitespace
                 result["material"] = material
             else:
-                # Fallback: look for common material names anywhere in text
-                text_upper = text.upper()
-                
                 # For Bambu Lab: Check Filament Code patterns
                 # Filament codes often indicate material type
                 if brand == "bambu":
-                    filament_code_match = re.search(r'(?:Filament Code|Code)[\s:]*(\d+)', text, re.IGNORECASE)
+                    filament_code_match = _RE_FILAMENT_CODE.search(text)
                     if filament_code_match:
                         code = filament_code_match.group(1)
                         # Bambu Lab filament code patterns:
@@ -463,20 +832,21 @@ class LabelParser:
                         elif code.startswith('3'):
                             result["material"] = "ABS"
                 
-                # Check compound materials first (PETG HF before PETG, PLA+ before PLA)
+                # One scan with compounds ordered first (PETG HF before
+                # PETG, PLA+ before PLA); no text.upper() copy needed
                 if not result["material"]:
-                    if "PETG HF" in text_upper or "PETGHF" in text_upper or "PETG-HF" in text_upper:
-                        result["material"] = "PETG HF"
-                    elif "PLA+" in text_upper or "PLA +" in text_upper or "PLA PLUS" in text_upper:
-                        result["material"] = "PLA+"
-                    elif "PETG" in text_upper:
-                        result["material"] = "PETG"
-                    elif "PLA" in text_upper:
-                        result["material"] = "PLA"
-                    elif "ABS" in text_upper:
-                        result["material"] = "ABS"
-                    elif "TPU" in text_upper:
-                        result["material"] = "TPU"
+                    best_material = None
+                    for fallback_material in _MATERIAL_FALLBACK_RE.finditer(text):
+                        key = (fallback_material.group(1).upper()
+                               .replace(" ", "").replace("-", ""))
+                        material_name = _MATERIAL_CANONICAL[key]
+                        if (best_material is None
+                                or _MATERIAL_RANK[material_name] < _MATERIAL_RANK[best_material]):
+                            best_material = material_name
+                            if _MATERIAL_RANK[best_material] == 0:
+                                break
+                    if best_material:
+                        result["material"] = best_material
                 
                 # For Bambu Lab: Default to PLA if no material found (most common)
                 if brand == "bambu" and not result["material"]:
@@ -485,68 +855,44 @@ class LabelParser:
             # Color
             # First, check for Chinese color names (for Bambu Lab labels)
             if brand == "bambu":
-                for chinese_color, english_color in LabelParser.CHINESE_COLOR_MAP.items():
-                    if chinese_color in text:
-                        result["color_name"] = english_color
-                        break
+                chinese_match = LabelParser.CHINESE_COLOR_RE.search(text)
+                if chinese_match:
+                    result["color_name"] = LabelParser.CHINESE_COLOR_MAP[chinese_match.group(0)]
 
             # Try common English color word search (more reliable than regex patterns)
             if not result["color_name"]:
-                # Map OCR misreadings to correct color names
-                color_corrections = {
-                    "yelow": "Yellow",
-                    "yellw": "Yellow",
-                    "yello": "Yellow",
-                    "olve": "Olive",
-                    "oliv": "Olive",
-                    "gren": "Green",
-                    "grene": "Green",
-                    "blak": "Black",
-                    "whit": "White",
-                    "whte": "White"
-                }
-                
-                common_colors = ["White", "Black", "Red", "Blue", "Green", "Yellow",
-                               "Orange", "Purple", "Grey", "Gray", "Silver", "Gold",
-                               "Pink", "Brown", "Natural", "Transparent", "Cyan", "Magenta", "Olive"]
-
                 # First check for OCR misreadings
                 text_lower = text.lower()
-                for misread, correct in color_corrections.items():
+                for misread, correct in _COLOR_CORRECTIONS.items():
                     if misread in text_lower:
                         result["color_name"] = correct
                         break
                 
                 # Then check for standard color names
                 if not result["color_name"]:
-                    for color in common_colors:
-                        # Look for color as whole word (case insensitive)
-                        if re.search(r'\b' + re.escape(color) + r'\b', text, re.IGNORECASE):
-                            result["color_name"] = color
-                            break
+                    # Single pass: the union matches any color as a whole word
+                    color_word_match = _COLOR_UNION.search(text)
+                    if color_word_match:
+                        result["color_name"] = color_word_match.group(1).title()
                 
                 # For Bambu Lab, also check after "With Spool" or near color indicators
                 if brand == "bambu" and not result["color_name"]:
                     # Look for pattern like "With Spool" followed by color
-                    spool_color_match = re.search(r'(?:With\s+Spool|Spool)[\s:]+([A-Z][a-z]+)', text, re.IGNORECASE)
+                    spool_color_match = _RE_SPOOL_COLOR.search(text)
                     if spool_color_match:
                         potential_color = spool_color_match.group(1)
-                        if potential_color in common_colors:
+                        if potential_color in _COMMON_COLORS:
                             result["color_name"] = potential_color
 
             # If no common color found, try brand-specific pattern
             if not result["color_name"]:
-                color_match = re.search(patterns["color"], text, re.IGNORECASE)
+                color_match = patterns["color"].search(text)
                 if color_match:
                     color_candidate = color_match.group(1).strip()
                     # Filter out invalid colors (brand names, materials, single letters, etc.)
-                    invalid_patterns = [
-                        r'^[A-Z0-9]{1,3}$',  # Short codes like "A1", "HIF"
-                        r'(?i)^(esun|sunlu|bambu|pla|petg|abs|tpu|filament)',  # Brand/material names
-                    ]
                     is_valid = True
-                    for pattern in invalid_patterns:
-                        if re.match(pattern, color_candidate):
+                    for pattern in _INVALID_COLOR_RES:
+                        if pattern.match(color_candidate):
                             is_valid = False
                             break
 
@@ -554,7 +900,7 @@ class LabelParser:
                         result["color_name"] = color_candidate.title()
 
             # Diameter
-            diameter_match = re.search(patterns["diameter"], text)
+            diameter_match = patterns["diameter"].search(text)
             if diameter_match:
                 # Try group 1 first (mm format), then group 2 (Chinese format)
                 diameter_str = diameter_match.group(1) or diameter_match.group(2)
@@ -563,23 +909,23 @@ class LabelParser:
             else:
                 # Fallback: look for diameter anywhere in text (handles Chinese labels)
                 # Pattern: number followed by mm or 毫米
-                fallback_diameter = re.search(r'(1\.75|2\.85|3\.0)[\s]*(?:mm|毫米)', text, re.IGNORECASE)
+                fallback_diameter = _RE_FALLBACK_DIAMETER.search(text)
                 if fallback_diameter:
                     result["diameter_mm"] = float(fallback_diameter.group(1))
                 else:
                     # Handle OCR misreadings: "{75mm" → "1.75mm", "175mm" → "1.75mm"
                     # Pattern: look for "75mm" or "85mm" preceded by {, [, or similar
-                    misread_diameter = re.search(r'[{\[]?\s*75\s*mm|175\s*mm|1\s*\.\s*75\s*mm', text, re.IGNORECASE)
+                    misread_diameter = _RE_MISREAD_DIAMETER_175.search(text)
                     if misread_diameter:
                         result["diameter_mm"] = 1.75
                     else:
-                        misread_diameter_285 = re.search(r'[{\[]?\s*85\s*mm|285\s*mm|2\s*\.\s*85\s*mm', text, re.IGNORECASE)
+                        misread_diameter_285 = _RE_MISREAD_DIAMETER_285.search(text)
                         if misread_diameter_285:
                             result["diameter_mm"] = 2.85
                         else:
                             # For Bambu Lab: Handle OCR misreadings (4.75 → 1.75, 4.85 → 2.85)
                             # Look for "(Diameter)" pattern which is common on Bambu labels
-                            diameter_section = re.search(r'\(Diameter\)\s*([0-9.]+)', text, re.IGNORECASE)
+                            diameter_section = _RE_DIAMETER_SECTION.search(text)
                             if diameter_section:
                                 diameter_value = float(diameter_section.group(1))
                                 
@@ -612,14 +958,24 @@ class LabelParser:
 
             # Barcode (if pattern exists)
             if patterns["barcode"]:
-                barcode_match = re.search(patterns["barcode"], text)
-                if barcode_match:
-                    result["barcode"] = barcode_match.group(0)
+                # Barcodes are standalone tokens on the label, so an anchored
+                # fullmatch per whitespace token fails fast instead of the
+                # pattern re-anchoring at every character of the text.
+                for token in text.split():
+                    if patterns["barcode"].fullmatch(token):
+                        result["barcode"] = token
+                        break
                 else:
+                    # Unanchored search catches barcodes OCR glued to
+                    # neighbouring characters
+                    barcode_match = patterns["barcode"].search(text)
+                    if barcode_match:
+                        result["barcode"] = barcode_match.group(0)
+                if not result["barcode"]:
                     # Fallback: look for barcode-like patterns (common OCR substitutions)
                     # X003II1ZZL might be read as X0O3II1ZZL, X003l11ZZL, etc.
                     # General pattern: X followed by alphanumeric characters
-                    fallback_match = re.search(r'X[0O][0O][0-9A-Z]{2}[0-9A-Z]{2}[0-9A-Z]{4}', text, re.IGNORECASE)
+                    fallback_match = _RE_FALLBACK_BARCODE.search(text)
                     if fallback_match:
                         barcode = fallback_match.group(0).upper()
                         # Fix common OCR mistakes
@@ -87,19 +87,20 @@ def process_invoices(input_dir: str, sheet_id: str, dry_run: bool = False, clear
             logger.info(f"  Vendor: {vendor}, Order: {order_number}, Items: {len(items)}")
             
             for item in items:
-                qty = item.get("quantity", 1)
+                # Items are InvoiceItem dataclasses, not dicts
+                qty = item.quantity
                 # Expand quantity into individual spool rows
                 for _ in range(qty):
                     spool_row = [
                         "", # ID (Auto)
                         "", # Product ID (Unknown)
-                        item.get("brand", ""),
-                        item.get("material", ""),
-                        item.get("color_name", ""),
-                        str(item.get("diameter_mm", 1.75)),
+                        item.brand,
+                        item.material,
+                        item.color_name,
+                        str(item.diameter_mm),
                         str(order_date) if order_date else "",
                         vendor,
-                        item.get("price", 0.0),
+                        item.price if item.price is not None else 0.0,
                         "Unsorted", # Storage Location
                         "in_stock", # Status
                         datetime.now().isoformat(), # Created At
@@ -65,12 +65,13 @@ def write_pdf_result_to_sheets(result: dict, spreadsheet_id: str, sheet_name: st
         rows_to_write = []
         
         if items:
+            # Items are InvoiceItem dataclasses, not dicts
             for item in items:
-                material = item.get("material", "N/A")
+                material = item.material
                 # Ensure material is not None or empty
                 if not material or material == "N/A":
                     material = "N/A"
-                
+
                 row = [
                     timestamp,
                     "PDF",
@@ -80,8 +81,8 @@ def write_pdf_result_to_sheets(result: dict, spreadsheet_id: str, sheet_name: st
                     material,  # Material column - one per item
                     parse_result.get("order_number", "N/A") if parse_result else "N/A",  # Order # column
                     str(parse_result.get("order_date", "N/A")) if parse_result else "N/A",
-                    item.get("quantity", 1),  # Items count per item
-                    f"${item.get('price', 0):.2f}",  # Price per item
+                    item.quantity,  # Items count per item
+                    f"${item.price or 0:.2f}",  # Price per item
                     ", ".join(result["errors"]) if result.get("errors") else "None",
                     result["validation"].get("page_count", "N/A") if result.get("validation") else "N/A",
                     f"{result['validation'].get('file_size_mb', 0):.2f} MB" if result.get("validation") else "N/A",
@@ -384,12 +385,11 @@ def test_pdf(pdf_path: str) -> dict:
             
             if parse_result.get('items'):
                 print(f"\n  Items:")
+                # Items are InvoiceItem dataclasses, not dicts
                 for i, item in enumerate(parse_result['items'], 1):
-                    qty = item.get('quantity', 1)
-                    price = item.get('price', 0)
-                    price_str = f"${price:.2f}" if price else "N/A"
-                    print(f"    {i}. {item.get('brand')} {item.get('material')} {item.get('color_name')} "
-                          f"(Qty: {qty}, Price: {price_str})")
+                    price_str = f"${item.price:.2f}" if item.price else "N/A"
+                    print(f"    {i}. {item.brand} {item.material} {item.color_name} "
+                          f"(Qty: {item.quantity}, Price: {price_str})")
             
         except ValueError as e:
             result["errors"].append(f"Parsing failed: {e}")
@@ -62,11 +62,11 @@ def test_pdf(pdf_path: str) -> dict:
             
             if parse_result.get('items'):
                 print(f"\n  Items:")
+                # Items are InvoiceItem dataclasses, not dicts
                 for i, item in enumerate(parse_result['items'], 1):
-                    price = item.get('price')
-                    price_str = f"${price:.2f}" if price else "N/A"
-                    print(f"    {i}. {item.get('brand')} {item.get('material')} {item.get('color_name')} "
-                          f"(Qty: {item.get('quantity', 0)}, Price: {price_str})")
+                    price_str = f"${item.price:.2f}" if item.price else "N/A"
+                    print(f"    {i}. {item.brand} {item.material} {item.color_name} "
+                          f"(Qty: {item.quantity}, Price: {price_str})")
             
         except ValueError as e:
             result["errors"].append(f"Parsing failed: {e}")
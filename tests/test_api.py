@@ -1,25 +1,38 @@
 import os
 import sys
 from pathlib import Path
-from typing import Iterator
+from typing import AsyncIterator, Iterator
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session, SQLModel
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
-# Ensure the app uses an in-memory database for tests
+# Keep the app's own engines off the real backend/app.db; the suite swaps
+# in file-backed test engines below via dependency override
 os.environ["DATABASE_URL"] = "sqlite:///:memory:"
 
-from backend.database import engine, get_session  # noqa: E402
+from backend.database import get_session  # noqa: E402
 from backend.main import app  # noqa: E402
 
+# Handlers are async, so the override serves AsyncSessions over aiosqlite.
+# A file-backed database lets table DDL run through a plain sync engine,
+# and NullPool keeps connections from outliving each test's event loop.
+TEST_DB_PATH = Path(__file__).resolve().parent / "test_app.db"
+ddl_engine = create_engine(f"sqlite:///{TEST_DB_PATH}")
+async_engine = create_async_engine(
+    f"sqlite+aiosqlite:///{TEST_DB_PATH}", poolclass=NullPool
+)
 
-def override_get_session() -> Iterator[Session]:
-    with Session(engine) as session:
+
+async def override_get_session() -> AsyncIterator[AsyncSession]:
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
         yield session
 
 
@@ -28,10 +41,10 @@ app.dependency_overrides[get_session] = override_get_session
 
 @pytest.fixture(autouse=True)
 def setup_database() -> Iterator[None]:
-    SQLModel.metadata.drop_all(engine)
-    SQLModel.metadata.create_all(engine)
+    SQLModel.metadata.drop_all(ddl_engine)
+    SQLModel.metadata.create_all(ddl_engine)
     yield
-    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.drop_all(ddl_engine)
 
 
 @pytest.fixture()
@@ -64,6 +77,35 @@ def test_create_and_retrieve_product(client: TestClient) -> None:
     assert retrieved["diameter_mm"] == payload["diameter_mm"]
 
 
+def test_list_products_pagination(client: TestClient) -> None:
+    for color in ("Yellow", "Black", "White"):
+        payload = {
+            "brand": "Sunlu",
+            "material": "PLA",
+            "color_name": color,
+            "diameter_mm": 1.75,
+        }
+        assert client.post("/api/v1/products", json=payload).status_code == 200
+
+    response = client.get("/api/v1/products", params={"limit": 2})
+    assert response.status_code == 200
+    page = response.json()
+
+    assert set(page) == {"items", "total", "limit", "offset"}
+    assert len(page["items"]) == 2
+    assert page["total"] == 3
+    assert page["limit"] == 2
+    assert page["offset"] == 0
+
+    rest = client.get("/api/v1/products", params={"limit": 2, "offset": 2})
+    assert rest.status_code == 200
+    assert len(rest.json()["items"]) == 1
+
+    # limit is clamped to 1..500
+    assert client.get("/api/v1/products", params={"limit": 1000}).status_code == 422
+    assert client.get("/api/v1/products", params={"limit": 0}).status_code == 422
+
+
 def test_create_and_update_spool(client: TestClient) -> None:
     product_payload = {
         "brand": "Bambu",
@@ -98,3 +140,10 @@ def test_create_and_update_spool(client: TestClient) -> None:
     fetched_resp = client.get(f"/api/v1/spools/{spool['id']}")
     assert fetched_resp.status_code == 200
     assert fetched_resp.json()["status"] == "used_up"
+
+    listed = client.get("/api/v1/spools")
+    assert listed.status_code == 200
+    page = listed.json()
+    assert set(page) == {"items", "total", "limit", "offset"}
+    assert page["total"] == 1
+    assert page["items"][0]["status"] == "used_up"